@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class WarhammerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "warhammer"
+
+    def ready(self):
+        from . import instrumentation, signals  # noqa: F401
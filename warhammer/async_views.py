@@ -0,0 +1,201 @@
+"""
+Async versions of the read-only map endpoints, for the ASGI app.
+Queries run on the psycopg 3 connection pool, so one worker can serve
+many concurrent map clients without holding a thread per request. The
+session filters are the sync views' queryset compiled to SQL, so
+responses (including search ranking) match the synchronous endpoints. The live session feed is
+async only, as each client holds its connection open.
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.gis.geos import Point
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+
+from .counties import county_index
+from .db_pool import fetch_all, fetch_value
+from .live import ensure_listener, get_broker
+from .views import (
+    CLUSTER_CELL_PX,
+    CLUSTER_MAX_ZOOM,
+    SESSION_CLUSTER_SQL,
+    SESSION_GEOJSON_SQL,
+    TIME_WINDOW_ERROR,
+    _ids_sql,
+    cluster_rows_to_geojson,
+    filtered_sessions,
+)
+
+# Seconds between keep-alive comments on an idle live feed
+LIVE_HEARTBEAT_SECONDS = 15
+# Seconds before a live feed is ended and the client reconnects. Django
+# does not tell a streaming response that its client has gone, so this
+# bounds how long a dropped client's subscription is kept
+LIVE_MAX_SECONDS = 300
+
+VENUES_GEOJSON_SQL = """
+    SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', COALESCE(
+            json_agg(
+                json_build_object(
+                    'type', 'Feature',
+                    'geometry', json_build_object(
+                        'type', 'Point',
+                        'coordinates', json_build_array(ST_X(location), ST_Y(location))
+                    ),
+                    'properties', json_build_object('id', id, 'name', name)
+                )
+                ORDER BY id
+            ),
+            '[]'::json
+        )
+    )::text
+    FROM warhammer_venue
+    WHERE location IS NOT NULL;
+"""
+
+
+def _error(message, status=400):
+    return JsonResponse({"error": message}, status=status)
+
+
+def _method_not_allowed(request):
+    if request.method != "GET":
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    return None
+
+
+# SQL selecting the ids of the sessions the sync views would return, in
+# the same order: the shared filtered_sessions queryset, compiled to SQL.
+# Compiling needs the sync database connection (the province check, the
+# PostGIS version), so it runs in a thread; the query itself does not
+@sync_to_async
+def _session_ids_sql(params, bbox=None, ordered=True):
+    return _ids_sql(filtered_sessions(params, bbox), ordered=ordered)
+
+
+async def _session_geojson_response(params, bbox=None):
+    ids_sql, ids_params = await _session_ids_sql(params, bbox)
+    text = await fetch_value(SESSION_GEOJSON_SQL.format(ids_sql=ids_sql), ids_params)
+    return HttpResponse(text, content_type="application/json")
+
+
+# Async sessions_geojson
+async def sessions_geojson(request):
+    not_allowed = _method_not_allowed(request)
+    if not_allowed:
+        return not_allowed
+    try:
+        return await _session_geojson_response(request.GET)
+    except ValueError:
+        return JsonResponse(TIME_WINDOW_ERROR, status=400)
+
+
+# Async sessions_in_bbox (including ?cluster=1&zoom=<z>)
+async def sessions_in_bbox(request):
+    not_allowed = _method_not_allowed(request)
+    if not_allowed:
+        return not_allowed
+    try:
+        bbox = [float(request.GET.get(edge)) for edge in ("west", "south", "east", "north")]
+    except (TypeError, ValueError):
+        return _error("west, south, east, north are required as floats")
+
+    zoom = None
+    if request.GET.get("cluster", "").strip():
+        try:
+            zoom = int(request.GET.get("zoom"))
+        except (TypeError, ValueError):
+            return _error("zoom is required as an integer when cluster is set")
+
+    try:
+        if zoom is not None and zoom <= CLUSTER_MAX_ZOOM:
+            ids_sql, ids_params = await _session_ids_sql(request.GET, bbox, ordered=False)
+            cell_size = 360.0 / (256 * 2 ** zoom) * CLUSTER_CELL_PX
+            rows = await fetch_all(SESSION_CLUSTER_SQL.format(ids_sql=ids_sql), [*ids_params, cell_size])
+            return JsonResponse(cluster_rows_to_geojson(rows))
+        return await _session_geojson_response(request.GET, bbox)
+    except ValueError:
+        return JsonResponse(TIME_WINDOW_ERROR, status=400)
+
+
+# Async venues_geojson
+async def venues_geojson(request):
+    not_allowed = _method_not_allowed(request)
+    if not_allowed:
+        return not_allowed
+    text = await fetch_value(VENUES_GEOJSON_SQL)
+    return HttpResponse(text, content_type="application/json")
+
+
+# Async county_for_point, answered from the in-process county index
+async def county_for_point(request):
+    not_allowed = _method_not_allowed(request)
+    if not_allowed:
+        return not_allowed
+    lat = request.GET.get("lat")
+    lng = request.GET.get("lng")
+    if not lat or not lng:
+        return _error("lat and lng are required")
+    try:
+        lat = float(lat)
+        lng = float(lng)
+    except ValueError:
+        return _error("lat and lng must be numbers")
+    detail = request.GET.get("geometry", "full").strip() or "full"
+    if detail not in ("full", "simplified", "none"):
+        return _error("geometry must be one of full, simplified, none")
+
+    # the index only touches the database when the boundaries changed
+    index = await sync_to_async(county_index)()
+    county = index.lookup(Point(lng, lat, srid=4326))
+    if not county:
+        return _error("No county found", status=404)
+    return JsonResponse(county.to_feature(detail))
+
+
+# Server-sent events feed of session diffs for a bbox (add, update, remove)
+async def sessions_live(request):
+    not_allowed = _method_not_allowed(request)
+    if not_allowed:
+        return not_allowed
+    bbox = None
+    if any(request.GET.get(edge) for edge in ("west", "south", "east", "north")):
+        try:
+            bbox = [float(request.GET.get(edge)) for edge in ("west", "south", "east", "north")]
+        except (TypeError, ValueError):
+            return _error("west, south, east, north must all be floats")
+
+    ensure_listener()
+    subscription = get_broker().subscribe(
+        bbox=bbox,
+        system=request.GET.get("system", "").strip(),
+        open_only=bool(request.GET.get("open", "").strip()),
+        province=request.GET.get("province", "").strip(),
+    )
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + LIVE_MAX_SECONDS
+        try:
+            yield "retry: 5000\n\n"
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    diff = await subscription.get(timeout=min(LIVE_HEARTBEAT_SECONDS, remaining))
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                op = diff.pop("op")
+                yield f"event: {op}\ndata: {json.dumps(diff)}\n\n"
+            # changes made while the client reconnects are not replayed
+            yield "event: resync\ndata: {}\n\n"
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
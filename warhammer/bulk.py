@@ -0,0 +1,84 @@
+"""
+Bulk loading helpers for venues and game sessions.
+Rows are inserted with bulk_create in large batches, then the new rows'
+effective locations and counties are resolved in SQL instead of going
+through each model's save().
+"""
+
+from itertools import islice
+
+from django.db import connection
+
+from .management.commands.assign_counties import COUNTY_FOR_POINT_SQL
+from .models import GameSession, Venue
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+# Splits an iterable into lists of at most `size` items
+def batched(iterable, size):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+# Inserts Venue instances in batches; returns them with primary keys set
+def bulk_create_venues(venues, batch_size=DEFAULT_BATCH_SIZE):
+    created = []
+    for batch in batched(venues, batch_size):
+        created.extend(Venue.objects.bulk_create(batch, batch_size=batch_size))
+    return created
+
+
+# Inserts GameSession instances in batches; returns the new ids
+def bulk_create_sessions(sessions, batch_size=DEFAULT_BATCH_SIZE):
+    ids = []
+    for batch in batched(sessions, batch_size):
+        ids.extend(s.pk for s in GameSession.objects.bulk_create(batch, batch_size=batch_size))
+    return ids
+
+
+# Does in SQL what save() does per row, for the given new venues and
+# sessions only: venue counties, then session effective locations (own
+# location, else the venue's) and counties
+def resolve_locations(venue_ids=(), session_ids=(), batch_size=DEFAULT_BATCH_SIZE):
+    with connection.cursor() as cur:
+        for batch in batched(venue_ids, batch_size):
+            cur.execute(
+                f"""
+                UPDATE warhammer_venue v
+                SET county_id = ({COUNTY_FOR_POINT_SQL.format(point="v.location")})
+                WHERE v.id = ANY(%s)
+                AND v.location IS NOT NULL;
+                """,
+                [batch],
+            )
+        for batch in batched(session_ids, batch_size):
+            cur.execute(
+                """
+                WITH resolved AS (
+                    SELECT s.id, COALESCE(s.location, v.location) AS location
+                    FROM warhammer_gamesession s
+                    LEFT JOIN warhammer_venue v ON v.id = s.venue_id
+                    WHERE s.id = ANY(%s)
+                )
+                UPDATE warhammer_gamesession s
+                SET effective_location = r.location
+                FROM resolved r
+                WHERE s.id = r.id
+                AND s.effective_location IS DISTINCT FROM r.location;
+                """,
+                [batch],
+            )
+            cur.execute(
+                f"""
+                UPDATE warhammer_gamesession s
+                SET county_id = ({COUNTY_FOR_POINT_SQL.format(point="s.effective_location")})
+                WHERE s.id = ANY(%s)
+                AND s.effective_location IS NOT NULL;
+                """,
+                [batch],
+            )
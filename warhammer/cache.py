@@ -0,0 +1,108 @@
+"""
+Versioned response cache for the shared map data endpoints.
+Responses are keyed by a data-version counter kept in the database and
+bumped by triggers whenever venues, sessions or boundaries change, and
+are answered with an ETag so repeat visitors get a 304 Not Modified.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+from .models import DataVersion
+
+DATA_VERSION = "data"
+BOUNDARY_VERSION = "boundary"
+RESPONSE_TIMEOUT = 60 * 60
+
+
+def map_data_cache():
+    return caches[getattr(settings, "MAP_DATA_CACHE", "default")]
+
+
+# Current value of a database-backed version counter. Read on every call,
+# so a change committed by any process (or a raw SQL management command)
+# is seen straight away
+def get_version(name):
+    return DataVersion.objects.filter(name=name).values_list("version", flat=True).first() or 0
+
+
+# Moves a counter on (writes to the tables behind it already do this
+# through their triggers, see migrations 0016 and 0017)
+def bump_version(name):
+    DataVersion.objects.filter(name=name).update(version=F("version") + 1)
+
+
+def data_version():
+    return get_version(DATA_VERSION)
+
+
+# Invalidates every cached response by moving to a new version
+def bump_data_version():
+    bump_version(DATA_VERSION)
+
+
+# Version of the county boundaries (changes whenever a county is written,
+# e.g. by load_counties)
+def boundary_version():
+    return get_version(BOUNDARY_VERSION)
+
+
+# Caches a GET view's response per value of a version counter, with
+# ETag/If-None-Match support
+def cached_by_version(name):
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return view_func(request, *args, **kwargs)
+
+            raw_key = "|".join([
+                name,
+                str(get_version(name)),
+                request.get_full_path(),
+                request.META.get("HTTP_ACCEPT", ""),
+            ])
+            digest = hashlib.md5(raw_key.encode("utf-8")).hexdigest()
+            etag = f'"{digest}"'
+
+            if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+                response = HttpResponseNotModified()
+                response["ETag"] = etag
+                return response
+
+            cache = map_data_cache()
+            cache_key = f"warhammer:response:{digest}"
+            cached = cache.get(cache_key)
+            if cached is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming:
+                    return response
+                if hasattr(response, "render"):
+                    response.render()
+                cached = (response.content, response["Content-Type"])
+                cache.set(cache_key, cached, RESPONSE_TIMEOUT)
+
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response["ETag"] = etag
+            response["Cache-Control"] = "no-cache"
+            patch_vary_headers(response, ["Accept"])
+            return response
+
+        return wrapper
+    return decorator
+
+
+# Map data that changes with any venue or session write
+cached_by_data_version = cached_by_version(DATA_VERSION)
+
+# County and province outlines, which only change when boundaries are
+# reloaded or provinces rebuilt
+cached_by_boundary_version = cached_by_version(BOUNDARY_VERSION)
@@ -0,0 +1,127 @@
+"""
+County and province boundary helpers:
+- pre-simplified boundary detail levels, chosen by map zoom.
+- in-process spatial index for county reverse lookups. The 26 county
+  boundaries are loaded once into prepared GEOS geometries behind a
+  bounding-box index, so a point lookup needs no database round trip.
+  The index is rebuilt when the database-backed boundary version changes
+  (e.g. after load_counties runs in any process); the version is checked
+  at most every COUNTY_INDEX_RECHECK_SECONDS.
+"""
+
+import json
+import threading
+import time
+
+from .cache import boundary_version
+from .models import County
+
+# Pre-simplified boundary columns on County and Province, as
+# (column, tolerance in degrees, highest zoom it is served at)
+BOUNDARY_DETAIL_LEVELS = (
+    ("geom_coarse", 0.01, 7),
+    ("geom_medium", 0.005, 9),
+    ("geom_fine", 0.001, 11),
+)
+
+# Tolerance (degrees, ~100m) for the "simplified" geometry option
+SIMPLIFY_TOLERANCE = 0.001
+
+
+# SQL expression simplifying a geometry column into a valid multipolygon
+def simplified_geom_sql(column, tolerance):
+    return f"ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_SimplifyPreserveTopology({column}, {tolerance})), 3))"
+
+
+# Picks the boundary column for a map zoom level (full detail when zoomed in)
+def boundary_column_for_zoom(zoom):
+    for column, _, max_zoom in BOUNDARY_DETAIL_LEVELS:
+        if zoom <= max_zoom:
+            return column
+    return "geom"
+
+
+# One indexed county: its envelope, prepared geometry and cached GeoJSON
+class CountyEntry:
+    def __init__(self, county):
+        self.id = county.id
+        self.name = county.name
+        self.province = county.province
+        self.geom = county.geom
+        self.extent = county.geom.extent
+        self.prepared = county.geom.prepared
+        self._geojson = {}
+
+    def envelope_contains(self, x, y):
+        xmin, ymin, xmax, ymax = self.extent
+        return xmin <= x <= xmax and ymin <= y <= ymax
+
+    # GeoJSON geometry dict for "full" or "simplified" detail, built once
+    def geometry(self, detail):
+        if detail not in self._geojson:
+            geom = self.geom
+            if detail == "simplified":
+                geom = geom.simplify(SIMPLIFY_TOLERANCE, preserve_topology=True)
+            self._geojson[detail] = json.loads(geom.geojson)
+        return self._geojson[detail]
+
+    # Same shape as CountySerializer, optionally without the geometry
+    def to_feature(self, detail="full"):
+        return {
+            "id": self.id,
+            "type": "Feature",
+            "geometry": None if detail == "none" else self.geometry(detail),
+            "properties": {"name": self.name, "province": self.province},
+        }
+
+
+# Envelope-filtered index over prepared county geometries
+class CountyIndex:
+    def __init__(self, counties):
+        # sorted by min x so the envelope scan can stop early
+        self.entries = sorted((CountyEntry(c) for c in counties), key=lambda e: e.extent[0])
+        # prepared geometries build their internal index lazily, so
+        # predicates are serialised between threads
+        self._lock = threading.Lock()
+
+    def _candidates(self, point):
+        x, y = point.x, point.y
+        for entry in self.entries:
+            if entry.extent[0] > x:
+                break
+            if entry.envelope_contains(x, y):
+                yield entry
+
+    # Returns the county covering a point, falling back to boundary intersection
+    def lookup(self, point):
+        candidates = list(self._candidates(point))
+        with self._lock:
+            for entry in candidates:
+                if entry.prepared.covers(point):
+                    return entry
+            for entry in candidates:
+                if entry.prepared.intersects(point):
+                    return entry
+        return None
+
+
+COUNTY_INDEX_RECHECK_SECONDS = 5
+
+_index = None
+_index_version = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+# Returns the process-wide county index, rebuilding it if the boundaries changed
+def county_index():
+    global _index, _index_version, _checked_at
+    if _index is not None and time.monotonic() - _checked_at < COUNTY_INDEX_RECHECK_SECONDS:
+        return _index
+    version = boundary_version()
+    with _lock:
+        if _index is None or _index_version != version:
+            _index = CountyIndex(County.objects.all())
+            _index_version = version
+        _checked_at = time.monotonic()
+    return _index
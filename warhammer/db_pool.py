@@ -0,0 +1,84 @@
+"""
+Async PostgreSQL connection pool (psycopg 3) for the ASGI map endpoints.
+One pool per event loop, opened lazily; connections are health-checked
+when they are handed out, so a dropped server connection is replaced
+instead of failing the request.
+"""
+
+import asyncio
+import time
+import weakref
+
+from django.conf import settings
+from psycopg import AsyncClientCursor
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+
+from .instrumentation import current_timing
+
+_pools = weakref.WeakKeyDictionary()
+
+
+def _conninfo():
+    db = settings.DATABASES["default"]
+    return make_conninfo(
+        dbname=db["NAME"],
+        user=db.get("USER") or None,
+        password=db.get("PASSWORD") or None,
+        host=db.get("HOST") or None,
+        port=db.get("PORT") or None,
+    )
+
+
+# Returns the pool for the running event loop, opening it on first use
+async def get_pool():
+    loop = asyncio.get_running_loop()
+    entry = _pools.get(loop)
+    if entry is None:
+        options = getattr(settings, "ASYNC_DB_POOL", {})
+        pool = AsyncConnectionPool(
+            _conninfo(),
+            min_size=options.get("MIN_SIZE", 2),
+            max_size=options.get("MAX_SIZE", 20),
+            timeout=options.get("TIMEOUT", 10),
+            check=AsyncConnectionPool.check_connection,
+            # client-side binding, as Django uses, so SQL compiled from
+            # querysets behaves the same on these connections
+            kwargs={"cursor_factory": AsyncClientCursor},
+            open=False,
+        )
+        entry = (pool, asyncio.ensure_future(pool.open()))
+        _pools[loop] = entry
+    pool, opening = entry
+    await opening
+    return pool
+
+
+# Runs a query on a pooled connection, counting it in the request's timings
+async def _execute(cur, sql, params):
+    start = time.perf_counter()
+    try:
+        await cur.execute(sql, params)
+    finally:
+        timing = current_timing()
+        if timing is not None:
+            timing.record((time.perf_counter() - start) * 1000, sql, params)
+
+
+# Runs a query on a pooled connection and returns the first column of the first row
+async def fetch_value(sql, params=()):
+    pool = await get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await _execute(cur, sql, params)
+            row = await cur.fetchone()
+    return row[0] if row else None
+
+
+# Runs a query on a pooled connection and returns all rows
+async def fetch_all(sql, params=()):
+    pool = await get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await _execute(cur, sql, params)
+            return await cur.fetchall()
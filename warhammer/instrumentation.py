@@ -0,0 +1,239 @@
+"""
+Per-request instrumentation for the API views.
+Records query count, SQL time, serialization time and response size,
+emits them as a Server-Timing header and logs slow requests with their
+SQL (and optionally EXPLAIN plans, with ANALYZE for plain reads). Disabled unless
+INSTRUMENT_REQUESTS is set, in which case the middleware removes itself.
+The current request's timings live in a context variable, so they follow
+the request into sync_to_async threads when served over ASGI.
+"""
+
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import JsonResponse
+
+logger = logging.getLogger("warhammer.instrumentation")
+
+# statements kept per request for slow-request logging
+MAX_RECORDED_STATEMENTS = 200
+# slowest statements explained when SLOW_REQUEST_EXPLAIN is on
+MAX_EXPLAINED_STATEMENTS = 3
+# EXPLAIN ANALYZE really runs the statement, so only plain reads get it:
+# anything that writes or has side effects (NOTIFY, sequences, locks) is
+# explained without ANALYZE
+NOT_A_PLAIN_READ = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE|COPY|NOTIFY|PG_NOTIFY|NEXTVAL|SETVAL"
+    r"|PG_ADVISORY\w*|PG_TERMINATE_BACKEND|PG_CANCEL_BACKEND|DBLINK\w*|FOR\s+(NO\s+KEY\s+)?UPDATE|FOR\s+(KEY\s+)?SHARE)\b",
+    re.IGNORECASE,
+)
+
+_current = ContextVar("warhammer_request_timing", default=None)
+
+
+# Timings collected for one request
+class RequestTiming:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.serialize_ms = 0.0
+        self.statements = []
+
+    # Database execute wrapper: counts and times every statement
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record((time.perf_counter() - start) * 1000, sql, params)
+
+    def record(self, elapsed, sql, params):
+        self.queries += 1
+        self.sql_ms += elapsed
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            self.statements.append((elapsed, sql, params))
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.start) * 1000
+
+
+# The timing of the request being served, if it is instrumented
+def current_timing():
+    return _current.get()
+
+
+# Makes `timing` the current request's timing; returns a token for stop_timing
+def start_timing(timing):
+    return _current.set(timing)
+
+
+def stop_timing(token):
+    _current.reset(token)
+
+
+# Execute wrapper on every connection, feeding the current request's timing.
+# Database connections are per thread, so wrapping one connection in the
+# middleware would miss queries run by sync views under ASGI
+def _record_statement(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def _wrap_connection(sender, connection, **kwargs):
+    if _record_statement not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_statement)
+
+
+# Times a block as serialization (excluding any SQL it runs) when instrumented
+@contextmanager
+def timed_serialization():
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    sql_before = timing.sql_ms
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        timing.serialize_ms += elapsed - (timing.sql_ms - sql_before)
+
+
+# JsonResponse whose encoding is counted as serialization time
+def timed_json_response(data, **kwargs):
+    with timed_serialization():
+        return JsonResponse(data, **kwargs)
+
+
+def _server_timing(timing, total_ms, size):
+    app_ms = max(total_ms - timing.sql_ms - timing.serialize_ms, 0.0)
+    return ", ".join([
+        f'db;dur={timing.sql_ms:.1f};desc="{timing.queries} queries"',
+        f"serialize;dur={timing.serialize_ms:.1f}",
+        f"app;dur={app_ms:.1f}",
+        f"total;dur={total_ms:.1f}",
+        f'size;desc="{size} bytes"',
+    ])
+
+
+def _is_plain_read(sql):
+    return sql.lstrip().upper().startswith(("SELECT", "WITH")) and not NOT_A_PLAIN_READ.search(sql)
+
+
+# Explains the slowest SELECT/WITH statements of a request: EXPLAIN
+# (ANALYZE) for plain reads, a plain EXPLAIN for the rest. Each runs in a
+# transaction (or savepoint) that is rolled back, so a failed EXPLAIN
+# leaves the request's transaction usable
+def _explain(statements):
+    plans = []
+    candidates = [s for s in statements if s[1].lstrip().upper().startswith(("SELECT", "WITH"))]
+    for elapsed, sql, params in sorted(candidates, key=lambda s: s[0], reverse=True)[:MAX_EXPLAINED_STATEMENTS]:
+        options = "ANALYZE, BUFFERS" if _is_plain_read(sql) else "COSTS"
+        try:
+            with transaction.atomic(), connection.cursor() as cur:
+                cur.execute(f"EXPLAIN ({options}) {sql}", params)
+                plans.append("\n".join(row[0] for row in cur.fetchall()))
+                transaction.set_rollback(True)
+        except Exception as exc:  # the plan is diagnostic only
+            plans.append(f"EXPLAIN failed: {exc}")
+    return plans
+
+
+class RequestInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "INSTRUMENT_REQUESTS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, "SLOW_REQUEST_MS", 500)
+        self.explain = getattr(settings, "SLOW_REQUEST_EXPLAIN", False)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timing = RequestTiming()
+        request.timing = timing
+        token = start_timing(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_timing(token)
+
+        slow = self._finish(response, timing)
+        if slow:
+            self._log_slow(request, timing, *slow)
+        return response
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        request.timing = timing
+        token = start_timing(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_timing(token)
+
+        slow = self._finish(response, timing)
+        if slow:
+            # may run EXPLAIN, which needs a sync database connection
+            await sync_to_async(self._log_slow)(request, timing, *slow)
+        return response
+
+    # Adds the Server-Timing header; returns (total_ms, size) if the request was slow
+    def _finish(self, response, timing):
+        total_ms = timing.total_ms
+        size = len(response.content) if not response.streaming else 0
+        response["Server-Timing"] = _server_timing(timing, total_ms, size)
+        if total_ms >= self.slow_ms:
+            return total_ms, size
+        return None
+
+    # DRF responses are rendered after the view; time that as serialization
+    def process_template_response(self, request, response):
+        timing = getattr(request, "timing", None)
+        if timing is not None:
+            start = time.perf_counter()
+            sql_before = timing.sql_ms
+
+            def rendered(response):
+                elapsed = (time.perf_counter() - start) * 1000
+                timing.serialize_ms += elapsed - (timing.sql_ms - sql_before)
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def _log_slow(self, request, timing, total_ms, size):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else request.path
+        statements = "\n".join(
+            f"  [{elapsed:.1f}ms] {sql} {params!r}"
+            for elapsed, sql, params in sorted(timing.statements, key=lambda s: s[0], reverse=True)
+        )
+        message = (
+            f"Slow request {request.method} {request.get_full_path()} ({view}): "
+            f"{total_ms:.1f}ms total, {timing.queries} queries in {timing.sql_ms:.1f}ms, "
+            f"serialize {timing.serialize_ms:.1f}ms, {size} bytes\n{statements}"
+        )
+        if self.explain:
+            message += "\n" + "\n\n".join(_explain(timing.statements))
+        logger.warning(message)
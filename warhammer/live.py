@@ -0,0 +1,198 @@
+"""
+Live session updates for map clients.
+Each client subscribes with its bbox and filters and gets small diffs:
+"add" when a session enters its view, "update" when one in view changes,
+"remove" when one leaves the view or is deleted. Changes come from the
+GameSession signals and are fanned out by an in-process broker; with
+LIVE_UPDATES_NOTIFY on they travel through PostgreSQL NOTIFY first, so
+every worker process sees every change.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "warhammer_sessions"
+# NOTIFY payloads are capped at 8000 bytes; bigger features are sent without
+# their body and clients refetch the session
+NOTIFY_MAX_PAYLOAD = 7900
+SUBSCRIPTION_QUEUE_SIZE = 256
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+# The parts of a session a subscription filters on
+def session_state(session, province=None):
+    if not session.effective_location:
+        return None
+    return {
+        "lng": session.effective_location.x,
+        "lat": session.effective_location.y,
+        "game_system": session.game_system,
+        "is_open": session.is_open,
+        "province": province,
+    }
+
+
+# A change to one session: its state before and after, plus the new feature
+def session_event(session_id, before, after, feature=None):
+    return {"id": session_id, "before": before, "after": after, "feature": feature}
+
+
+class Subscription:
+    def __init__(self, broker, bbox=None, system="", open_only=False, province=""):
+        self.broker = broker
+        self.bbox = bbox
+        self.system = system
+        self.open_only = open_only
+        self.province = province.upper()
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+
+    def matches(self, state):
+        if state is None:
+            return False
+        if self.bbox:
+            west, south, east, north = self.bbox
+            if not (west <= state["lng"] <= east and south <= state["lat"] <= north):
+                return False
+        if self.system and state["game_system"] != self.system:
+            return False
+        if self.open_only and not state["is_open"]:
+            return False
+        if self.province and (state["province"] or "").upper() != self.province:
+            return False
+        return True
+
+    # The diff this subscriber should see for an event, or None
+    def diff(self, event):
+        was = self.matches(event["before"])
+        now = self.matches(event["after"])
+        if now:
+            return {"op": "update" if was else "add", "id": event["id"], "feature": event["feature"]}
+        if was:
+            return {"op": "remove", "id": event["id"]}
+        return None
+
+    # Called from whichever thread published the change
+    def offer(self, event):
+        diff = self.diff(event)
+        if diff is not None:
+            try:
+                self.loop.call_soon_threadsafe(self._put, diff)
+            except RuntimeError:
+                # the subscriber's event loop has been closed
+                self.close()
+
+    def _put(self, diff):
+        try:
+            self.queue.put_nowait(diff)
+        except asyncio.QueueFull:
+            # a client this far behind reloads its view instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"op": "resync"})
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, **filters):
+        subscription = Subscription(self, **filters)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.offer(event)
+
+
+# The process-wide broker, built from the LIVE_BROKER setting
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            path = getattr(settings, "LIVE_BROKER", "warhammer.live.InProcessBroker")
+            _broker = import_string(path)()
+        return _broker
+
+
+# Swaps the process-wide broker (e.g. for a stand-in), returning the old one
+def set_broker(broker):
+    global _broker
+    with _broker_lock:
+        previous, _broker = _broker, broker
+    return previous
+
+
+# Publishes a session change once the surrounding transaction commits
+def publish_change(event):
+    if getattr(settings, "LIVE_UPDATES_NOTIFY", False):
+        payload = json.dumps(event, cls=DjangoJSONEncoder)
+        if len(payload) > NOTIFY_MAX_PAYLOAD:
+            payload = json.dumps({**event, "feature": None}, cls=DjangoJSONEncoder)
+        # NOTIFY is transactional, so rolled back changes are never sent
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, payload])
+    else:
+        payload = json.loads(json.dumps(event, cls=DjangoJSONEncoder))
+        transaction.on_commit(lambda: get_broker().publish(payload))
+
+
+_listeners = {}
+
+
+# Starts the NOTIFY listener for the running event loop, if enabled
+def ensure_listener():
+    if not getattr(settings, "LIVE_UPDATES_NOTIFY", False):
+        return
+    loop = asyncio.get_running_loop()
+    task = _listeners.get(loop)
+    if task is None or task.done():
+        _listeners[loop] = loop.create_task(_listen())
+
+
+# Feeds NOTIFY payloads into the in-process broker, reconnecting on errors
+async def _listen():
+    import psycopg
+
+    from .db_pool import _conninfo
+
+    delay = 1
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(_conninfo(), autocommit=True) as conn:
+                await conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                delay = 1
+                async for notify in conn.notifies():
+                    get_broker().publish(json.loads(notify.payload))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Live updates listener lost its connection")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+
+# Columns copied from warhammer_gamesession into the archive
+ARCHIVE_COLUMNS = (
+    "id, title, description, game_system, points_level, organiser, organiser_contact, "
+    "start_time, max_players, current_players, location, effective_location, venue_id, "
+    "county_id, is_open, created_at"
+)
+
+# An id already in the archive (e.g. a session restored and archived
+# again) is overwritten with the row just deleted, never dropped
+ARCHIVE_UPSERT = ", ".join(
+    f"{column} = EXCLUDED.{column}"
+    for column in [c.strip() for c in ARCHIVE_COLUMNS.split(",")] + ["archived_at"]
+    if column != "id"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move game sessions that started before a cutoff into the archive table, in batches. "
+        "Meant to run on a schedule (e.g. nightly cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-hours", type=int, default=24, help="Archive sessions that started this long ago")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["older_than_hours"])
+        archived = 0
+
+        # each batch moves rows in one DELETE ... RETURNING statement, so
+        # locks stay short and a session is never in both tables
+        while True:
+            with transaction.atomic(), connection.cursor() as cur:
+                cur.execute(
+                    f"""
+                    WITH moved AS (
+                        DELETE FROM warhammer_gamesession
+                        WHERE id IN (
+                            SELECT id FROM warhammer_gamesession
+                            WHERE start_time < %s
+                            ORDER BY start_time
+                            LIMIT %s
+                            FOR UPDATE SKIP LOCKED
+                        )
+                        RETURNING {ARCHIVE_COLUMNS}
+                    ),
+                    archived AS (
+                        INSERT INTO warhammer_gamesessionarchive ({ARCHIVE_COLUMNS}, archived_at)
+                        SELECT {ARCHIVE_COLUMNS}, now() FROM moved
+                        ON CONFLICT (id) DO UPDATE SET {ARCHIVE_UPSERT}
+                    )
+                    SELECT count(*) FROM moved;
+                    """,
+                    [cutoff, options["batch_size"]],
+                )
+                # rows deleted from the live table, which all reach the archive
+                moved = cur.fetchone()[0]
+            archived += moved
+            if moved < options["batch_size"]:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} game sessions that started before {cutoff:%Y-%m-%d %H:%M}."))
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+
+
+# Picks the county covering a point, falling back to boundary intersection
+COUNTY_FOR_POINT_SQL = """
+    SELECT c.id
+    FROM warhammer_county c
+    WHERE ST_Intersects(c.geom, {point})
+    ORDER BY ST_Covers(c.geom, {point}) DESC, c.id
+    LIMIT 1
+"""
+
+
+class Command(BaseCommand):
+    help = "Assign the containing county to every venue, game session and archived session in one pass."
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), connection.cursor() as cur:
+            # only rows whose county changes are written
+            cur.execute(
+                f"""
+                WITH assigned AS (
+                    SELECT v.id, ({COUNTY_FOR_POINT_SQL.format(point="v.location")}) AS county_id
+                    FROM warhammer_venue v
+                )
+                UPDATE warhammer_venue v
+                SET county_id = a.county_id
+                FROM assigned a
+                WHERE v.id = a.id
+                AND v.county_id IS DISTINCT FROM a.county_id;
+                """
+            )
+            venues = cur.rowcount
+
+            cur.execute(
+                f"""
+                WITH assigned AS (
+                    SELECT s.id, ({COUNTY_FOR_POINT_SQL.format(point="s.effective_location")}) AS county_id
+                    FROM warhammer_gamesession s
+                )
+                UPDATE warhammer_gamesession s
+                SET county_id = a.county_id
+                FROM assigned a
+                WHERE s.id = a.id
+                AND s.county_id IS DISTINCT FROM a.county_id;
+                """
+            )
+            sessions = cur.rowcount
+
+            cur.execute(
+                f"""
+                WITH assigned AS (
+                    SELECT a.id, ({COUNTY_FOR_POINT_SQL.format(point="a.effective_location")}) AS county_id
+                    FROM warhammer_gamesessionarchive a
+                )
+                UPDATE warhammer_gamesessionarchive a
+                SET county_id = c.county_id
+                FROM assigned c
+                WHERE a.id = c.id
+                AND a.county_id IS DISTINCT FROM c.county_id;
+                """
+            )
+            archived = cur.rowcount
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated the county of {venues} venues, {sessions} game sessions and {archived} archived sessions."
+        ))
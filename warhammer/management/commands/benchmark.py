@@ -0,0 +1,140 @@
+import json
+import math
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+# one venue per this many sessions in generated fixtures
+SESSIONS_PER_VENUE = 50
+
+DUBLIN_BBOX = "west=-6.45&south=53.25&east=-6.05&north=53.45"
+IRELAND_BBOX = "west=-10.7&south=51.3&east=-5.4&north=55.5"
+
+# (name, method, path, body) for each endpoint under test
+ENDPOINTS = [
+    ("sessions_in_bbox", "get", f"/api/sessions/in-bbox/?{DUBLIN_BBOX}", None),
+    ("sessions_in_bbox_national", "get", f"/api/sessions/in-bbox/?{IRELAND_BBOX}", None),
+    ("sessions_in_bbox_province", "get", f"/api/sessions/in-bbox/?{IRELAND_BBOX}&province=Leinster", None),
+    ("sessions_geojson", "get", "/api/sessions/geojson/", None),
+    ("sessions_geojson_search", "get", "/api/sessions/geojson/?q=kill+team", None),
+    ("sessions_geojson_province", "get", "/api/sessions/geojson/?province=Munster", None),
+    ("sessions_nearest", "post", "/api/sessions/nearest/", {"lat": 53.3498, "lng": -6.2603, "limit": 10}),
+    ("county_for_point", "get", "/api/counties/for-point/?lat=53.3498&lng=-6.2603", None),
+]
+
+
+# Nearest-rank percentile of a sorted list
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the map endpoints against generated fixtures of several sizes and write "
+        "latency percentiles, query counts and response sizes as JSON. "
+        "Generating fixtures replaces all venues and sessions in the configured database, "
+        "so it needs --yes-wipe (or use --no-generate)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Session counts to benchmark")
+        parser.add_argument("--iterations", type=int, default=20, help="Timed requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per endpoint")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="bench_results.json")
+        parser.add_argument("--no-generate", action="store_true", help="Benchmark the data already loaded")
+        parser.add_argument(
+            "--yes-wipe",
+            action="store_true",
+            help="Confirm that all venues and sessions may be deleted to generate fixtures",
+        )
+
+    def handle(self, *args, **options):
+        if not options["no_generate"] and not options["yes_wipe"]:
+            db = connection.settings_dict["NAME"]
+            raise CommandError(
+                f"Generating fixtures deletes every venue and session in '{db}'. "
+                "Pass --yes-wipe to confirm, or --no-generate to benchmark the data already loaded."
+            )
+
+        client = Client(HTTP_HOST="localhost")
+        results = {
+            "generated_at": timezone.now().isoformat(),
+            "iterations": options["iterations"],
+            "sizes": {},
+        }
+
+        sizes = [None] if options["no_generate"] else options["sizes"]
+        for size in sizes:
+            if size is not None:
+                self.stdout.write(f"Generating {size} sessions...")
+                call_command(
+                    "generate_data",
+                    sessions=size,
+                    venues=max(1, size // SESSIONS_PER_VENUE),
+                    seed=options["seed"],
+                    clear=True,
+                )
+                with connection.cursor() as cur:
+                    cur.execute("ANALYZE warhammer_gamesession; ANALYZE warhammer_venue;")
+
+            label = str(size) if size is not None else "current"
+            results["sizes"][label] = {
+                name: self._run(client, method, path, body, options["warmup"], options["iterations"])
+                for name, method, path, body in ENDPOINTS
+            }
+            for name, stats in results["sizes"][label].items():
+                self.stdout.write(
+                    f"  {label:>8} {name:<28} p50={stats['p50_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms "
+                    f"queries={stats['queries']} bytes={stats['bytes']}"
+                )
+
+        with open(options["output"], "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote benchmark results to {options['output']}."))
+
+    def _request(self, client, method, path, body):
+        if method == "post":
+            response = client.post(path, data=json.dumps(body), content_type="application/json")
+        else:
+            response = client.get(path)
+        if response.streaming:
+            content = b"".join(response.streaming_content)
+        else:
+            content = response.content
+        return response.status_code, len(content)
+
+    def _run(self, client, method, path, body, warmup, iterations):
+        for _ in range(warmup):
+            self._request(client, method, path, body)
+
+        timings = []
+        queries = []
+        size = 0
+        status = None
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                status, size = self._request(client, method, path, body)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(ctx.captured_queries))
+
+        timings.sort()
+        return {
+            "status": status,
+            "p50_ms": percentile(timings, 50),
+            "p95_ms": percentile(timings, 95),
+            "p99_ms": percentile(timings, 99),
+            "mean_ms": sum(timings) / len(timings),
+            "queries": max(queries),
+            "bytes": size,
+        }
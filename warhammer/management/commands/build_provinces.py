@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from warhammer.counties import BOUNDARY_DETAIL_LEVELS, simplified_geom_sql
+
+
+class Command(BaseCommand):
+    help = "Dissolve county boundaries into one validated, pre-simplified multipolygon per province."
+
+    def handle(self, *args, **options):
+        columns = ", ".join(column for column, _, _ in BOUNDARY_DETAIL_LEVELS)
+        simplified = ", ".join(
+            simplified_geom_sql("geom", tolerance) for _, tolerance, _ in BOUNDARY_DETAIL_LEVELS
+        )
+
+        with transaction.atomic(), connection.cursor() as cur:
+            cur.execute("DELETE FROM warhammer_province;")
+            cur.execute(
+                f"""
+                INSERT INTO warhammer_province (name, geom, {columns})
+                SELECT name, geom, {simplified}
+                FROM (
+                    SELECT
+                        province AS name,
+                        ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_Union(ST_MakeValid(geom))), 3)) AS geom
+                    FROM warhammer_county
+                    WHERE province IS NOT NULL AND province <> ''
+                    GROUP BY province
+                ) dissolved;
+                """
+            )
+            built = cur.rowcount
+
+        self.stdout.write(self.style.SUCCESS(f"Built {built} province boundaries."))
@@ -0,0 +1,108 @@
+import csv
+import json
+import os
+
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from warhammer.bulk import DEFAULT_BATCH_SIZE, bulk_create_sessions, bulk_create_venues, resolve_locations
+from warhammer.models import GameSession, Venue
+
+
+# Yields one dict per row of a CSV or JSONL file
+def read_rows(path, fmt):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+# Point from "lat"/"lng" columns, or None when they are missing
+def row_point(row):
+    lat = row.get("lat")
+    lng = row.get("lng")
+    if lat in (None, "") or lng in (None, ""):
+        return None
+    return Point(float(lng), float(lat), srid=4326)
+
+
+def row_bool(value, default):
+    if value in (None, ""):
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import venues or game sessions from CSV/JSONL. "
+        "Venues: name, description, lat, lng. "
+        "Sessions: title, game_system, start_time, organiser, plus optional description, points_level, "
+        "organiser_contact, max_players, current_players, is_open, venue (name) and lat/lng."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=["venues", "sessions"])
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+        fmt = options["format"] or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        rows = read_rows(path, fmt)
+
+        # all or nothing: a bad row rolls back the rows before it
+        with transaction.atomic():
+            if options["kind"] == "venues":
+                venues = (
+                    Venue(name=r["name"], description=r.get("description") or "", location=row_point(r))
+                    for r in rows
+                )
+                venue_ids = [v.pk for v in bulk_create_venues(venues, options["batch_size"])]
+                session_ids = []
+            else:
+                # one query resolves every venue name to its id
+                names = dict(Venue.objects.values_list("name", "id"))
+                session_ids = bulk_create_sessions(
+                    (self._session(r, names) for r in rows), options["batch_size"]
+                )
+                venue_ids = []
+
+            # counties and effective locations of the new rows, in SQL
+            resolve_locations(venue_ids, session_ids, options["batch_size"])
+
+        created = len(venue_ids) + len(session_ids)
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} {options['kind']} from {path}."))
+
+    def _session(self, row, venue_ids):
+        venue_name = (row.get("venue") or "").strip()
+        if venue_name and venue_name not in venue_ids:
+            raise CommandError(f"Unknown venue '{venue_name}' for session '{row.get('title')}'")
+        start_time = parse_datetime(str(row["start_time"]))
+        if start_time is None:
+            raise CommandError(f"Invalid start_time '{row['start_time']}' for session '{row.get('title')}'")
+
+        return GameSession(
+            title=row["title"],
+            description=row.get("description") or "",
+            game_system=row.get("game_system") or "Warhammer 40,000",
+            points_level=row.get("points_level") or "",
+            organiser=row["organiser"],
+            organiser_contact=row.get("organiser_contact") or "",
+            start_time=start_time,
+            max_players=int(row.get("max_players") or 2),
+            current_players=int(row.get("current_players") or 1),
+            is_open=row_bool(row.get("is_open"), True),
+            location=row_point(row),
+            venue_id=venue_ids.get(venue_name) if venue_name else None,
+        )
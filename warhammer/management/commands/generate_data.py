@@ -0,0 +1,166 @@
+import math
+import random
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from warhammer.bulk import DEFAULT_BATCH_SIZE, bulk_create_sessions, bulk_create_venues, resolve_locations
+from warhammer.models import GameSession, Venue
+
+# Irish towns (name, lat, lng, relative weight, spread in km); venues and
+# sessions are scattered around them, weighted roughly by population
+TOWNS = [
+    ("Dublin", 53.3498, -6.2603, 40, 8),
+    ("Cork", 51.8985, -8.4756, 10, 5),
+    ("Limerick", 52.6638, -8.6267, 5, 4),
+    ("Galway", 53.2707, -9.0568, 5, 4),
+    ("Waterford", 52.2593, -7.1101, 3, 3),
+    ("Drogheda", 53.7179, -6.3561, 2, 3),
+    ("Dundalk", 54.0090, -6.4049, 2, 3),
+    ("Swords", 53.4597, -6.2181, 2, 3),
+    ("Bray", 53.2028, -6.0983, 2, 2),
+    ("Navan", 53.6528, -6.6814, 2, 3),
+    ("Kilkenny", 52.6541, -7.2448, 2, 3),
+    ("Naas", 53.2159, -6.6669, 2, 3),
+    ("Ennis", 52.8436, -8.9864, 1.5, 3),
+    ("Carlow", 52.8408, -6.9261, 1.5, 3),
+    ("Tralee", 52.2713, -9.6999, 1.5, 3),
+    ("Athlone", 53.4239, -7.9407, 1.5, 3),
+    ("Sligo", 54.2766, -8.4761, 1.5, 3),
+    ("Letterkenny", 54.9558, -7.7342, 1.5, 3),
+    ("Wexford", 52.3369, -6.4633, 1.5, 3),
+    ("Clonmel", 52.3558, -7.7039, 1, 3),
+    ("Mullingar", 53.5259, -7.3381, 1, 3),
+    ("Castlebar", 53.8550, -9.2988, 1, 3),
+    ("Portlaoise", 53.0344, -7.2998, 1, 3),
+    ("Tullamore", 53.2739, -7.4889, 1, 3),
+    ("Cavan", 53.9908, -7.3606, 1, 3),
+    ("Monaghan", 54.2492, -6.9683, 1, 3),
+    ("Longford", 53.7276, -7.7932, 1, 3),
+    ("Roscommon", 53.6333, -8.1833, 1, 3),
+    ("Carrick-on-Shannon", 53.9469, -8.0900, 1, 3),
+    ("Wicklow", 52.9808, -6.0446, 1, 3),
+]
+
+# (game system, weight, typical points levels)
+GAME_SYSTEMS = [
+    ("Warhammer 40,000", 45, ["1000pts", "2000pts", "Combat Patrol", "Incursion"]),
+    ("Age of Sigmar", 20, ["1000pts", "2000pts", "Spearhead"]),
+    ("Kill Team", 12, ["Standard", "Narrative"]),
+    ("The Horus Heresy", 8, ["2000pts", "3000pts", "Zone Mortalis"]),
+    ("Warcry", 5, ["1000pts", "Narrative"]),
+    ("Necromunda", 5, ["Campaign", "Skirmish"]),
+    ("The Old World", 5, ["1500pts", "2000pts"]),
+]
+
+VENUE_PREFIXES = ["Dice", "Dragon's", "Iron", "Crimson", "Grim", "Lucky", "Black", "Golden", "Warp", "Old"]
+VENUE_SUFFIXES = ["Games", "Hobbies", "Gaming Club", "Wargaming", "Tabletop", "Games Room", "Hobby Centre"]
+ORGANISERS = ["Aoife", "Cian", "Conor", "Niamh", "Sean", "Ciara", "Darragh", "Orla", "Eoin", "Roisin", "Liam", "Saoirse"]
+MAX_PLAYERS = [(2, 50), (4, 25), (6, 10), (8, 10), (16, 5)]
+
+# share of sessions placed at a venue (the rest get their own point)
+VENUE_SESSION_SHARE = 0.85
+PAST_DAYS = 60
+FUTURE_DAYS = 120
+PAST_SHARE = 0.25
+
+
+class Command(BaseCommand):
+    help = "Generate reproducible synthetic venues and game sessions spread across Ireland."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--venues", type=int, default=200, help="Number of venues to create")
+        parser.add_argument("--sessions", type=int, default=10000, help="Number of game sessions to create")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument("--anchor", help="Date (YYYY-MM-DD) start times are spread around; defaults to today")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--clear", action="store_true", help="Delete existing venues and sessions first")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        anchor_date = (
+            datetime.strptime(options["anchor"], "%Y-%m-%d").date()
+            if options["anchor"] else timezone.now().date()
+        )
+        anchor = timezone.make_aware(datetime.combine(anchor_date, time()), dt_timezone.utc)
+        batch_size = options["batch_size"]
+
+        if options["clear"]:
+            with transaction.atomic(), connection.cursor() as cur:
+                cur.execute("DELETE FROM warhammer_gamesession;")
+                # archived sessions keep their point but lose the venue
+                cur.execute("UPDATE warhammer_gamesessionarchive SET venue_id = NULL WHERE venue_id IS NOT NULL;")
+                cur.execute("DELETE FROM warhammer_venue;")
+
+        towns = TOWNS
+        town_weights = [t[3] for t in TOWNS]
+
+        venues = []
+        for i in range(options["venues"]):
+            town = rng.choices(towns, town_weights)[0]
+            name = f"{rng.choice(VENUE_PREFIXES)} {rng.choice(VENUE_SUFFIXES)} {town[0]} #{i + 1}"
+            venues.append(Venue(name=name, location=self._scatter(rng, town)))
+        venues = bulk_create_venues(venues, batch_size)
+
+        sessions = (
+            self._session(rng, anchor, venues, towns, town_weights)
+            for _ in range(options["sessions"])
+        )
+        session_ids = bulk_create_sessions(sessions, batch_size)
+        resolve_locations([v.pk for v in venues], session_ids, batch_size)
+        created = len(session_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(venues)} venues and {created} game sessions (seed {options['seed']})."
+        ))
+
+    # Random point around a town, normally distributed over its spread
+    def _scatter(self, rng, town):
+        _, lat, lng, _, spread_km = town
+        dlat = rng.gauss(0, spread_km / 111.0)
+        dlng = rng.gauss(0, spread_km / (111.0 * math.cos(math.radians(lat))))
+        return Point(lng + dlng, lat + dlat, srid=4326)
+
+    # Evening start on weekdays, daytime at weekends, mostly upcoming
+    def _start_time(self, rng, anchor):
+        if rng.random() < PAST_SHARE:
+            day = -rng.randint(1, PAST_DAYS)
+        else:
+            day = rng.randint(0, FUTURE_DAYS)
+        date = anchor + timedelta(days=day)
+        if date.weekday() >= 5:
+            hour = rng.choice([11, 12, 13, 14, 15, 16])
+        else:
+            hour = rng.choice([18, 18, 19, 19, 20])
+        return date + timedelta(hours=hour, minutes=rng.choice([0, 30]))
+
+    def _session(self, rng, anchor, venues, towns, town_weights):
+        system, _, points_levels = rng.choices(GAME_SYSTEMS, [s[1] for s in GAME_SYSTEMS])[0]
+        max_players = rng.choices([m for m, _ in MAX_PLAYERS], [w for _, w in MAX_PLAYERS])[0]
+        current_players = rng.randint(1, max_players)
+
+        venue = None
+        location = None
+        if venues and rng.random() < VENUE_SESSION_SHARE:
+            venue = rng.choice(venues)
+            title = f"{system} at {venue.name}"
+        else:
+            town = rng.choices(towns, town_weights)[0]
+            location = self._scatter(rng, town)
+            title = f"{system} in {town[0]}"
+
+        return GameSession(
+            title=title,
+            game_system=system,
+            points_level=rng.choice(points_levels),
+            organiser=rng.choice(ORGANISERS),
+            start_time=self._start_time(rng, anchor),
+            max_players=max_players,
+            current_players=current_players,
+            is_open=current_players < max_players,
+            location=location,
+            venue=venue,
+        )
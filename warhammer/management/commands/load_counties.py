@@ -1,45 +1,110 @@
 import os
 import json
+import hashlib
 
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from django.db import connection
+from django.db import connection, transaction
+
+from warhammer.counties import BOUNDARY_DETAIL_LEVELS, simplified_geom_sql
+from warhammer.models import BoundaryImport
+
+DEFAULT_GEOJSON_PATH = os.path.join(
+    settings.BASE_DIR,
+    "data",
+    "Counties___OSi_National_Statutory_Boundaries_1239634581601351404.geojson",
+)
+READ_CHUNK_SIZE = 1 << 20
+
+
+# SHA-256 of a file, read in chunks
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Yields the features of a GeoJSON FeatureCollection one at a time,
+# without loading the whole file into memory
+def iter_features(path):
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        # skip ahead to the opening bracket of the "features" array
+        while True:
+            key = buf.find('"features"')
+            bracket = buf.find("[", key) if key != -1 else -1
+            if bracket != -1:
+                buf = buf[bracket + 1:]
+                break
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            buf += chunk
+
+        eof = False
+        while True:
+            buf = buf.lstrip().lstrip(",").lstrip()
+            if buf.startswith("]") or (eof and not buf):
+                return
+            try:
+                feature, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                # the next feature is incomplete; read more of the file
+                if eof:
+                    raise
+                chunk = f.read(READ_CHUNK_SIZE)
+                eof = not chunk
+                buf += chunk
+                continue
+            yield feature
+            buf = buf[end:]
 
 
 class Command(BaseCommand):
     help = "Load Irish counties from the OSi GeoJSON (EPSG:2157) straight into PostGIS and transform to 4326."
 
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default=DEFAULT_GEOJSON_PATH, help="OSi county GeoJSON file")
+        parser.add_argument("--batch-size", type=int, default=50, help="Features per staging INSERT")
+        parser.add_argument("--force", action="store_true", help="Reload even if the file is unchanged")
+
     def handle(self, *args, **options):
-        # path to file 
-        geojson_path = os.path.join(
-            settings.BASE_DIR,
-            "data",
-            "Counties___OSi_National_Statutory_Boundaries_1239634581601351404.geojson",
-        )
+        geojson_path = options["path"]
+        batch_size = max(1, options["batch_size"])
 
         if not os.path.exists(geojson_path):
             self.stderr.write(self.style.ERROR(f"File not found: {geojson_path}"))
             return
 
-        # read the GeoJSON 
-        with open(geojson_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        features = data.get("features", [])
-        if not features:
-            self.stderr.write(self.style.ERROR("No features in the GeoJSON."))
+        # skip the reload when this exact file is already loaded
+        source = os.path.basename(geojson_path)
+        checksum = file_checksum(geojson_path)
+        already_loaded = BoundaryImport.objects.filter(source=source, checksum=checksum).exists()
+        if already_loaded and not options["force"]:
+            self.stdout.write(self.style.SUCCESS(f"{source} is unchanged (sha256 {checksum[:12]}), skipping reload."))
             return
 
-        # clear table to prevent duplicates
-        with connection.cursor() as cur:
-            cur.execute("DELETE FROM warhammer_county;")
-
-        inserted = 0
+        # stage, transform and swap in one transaction, so a failed run
+        # leaves the previous counties in place
+        with transaction.atomic(), connection.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TEMP TABLE county_staging (
+                    name text,
+                    province text,
+                    geom text
+                ) ON COMMIT DROP;
+                """
+            )
 
-        # insert each feature using PostGIS to do the transform
-        with connection.cursor() as cur:
-            for feat in features:
-                props = feat.get("properties", {})
+            staged = 0
+            batch = []
+            for feat in iter_features(geojson_path):
+                props = feat.get("properties") or {}
                 geom = feat.get("geometry")
 
                 if not geom:
@@ -47,26 +112,69 @@ class Command(BaseCommand):
 
                 name = props.get("COUNTY") or props.get("ENGLISH") or "Unknown"
                 province = (props.get("PROVINCE") or "").strip()
+                batch.append((name, province, json.dumps(geom)))
+
+                if len(batch) >= batch_size:
+                    staged += self._stage(cur, batch)
+                    batch = []
+            if batch:
+                staged += self._stage(cur, batch)
 
-                geom_json = json.dumps(geom)
+            if not staged:
+                self.stderr.write(self.style.ERROR("No features in the GeoJSON."))
+                return
+
+            # clear table to prevent duplicates (detach venues, sessions and
+            # archived sessions first)
+            cur.execute("UPDATE warhammer_venue SET county_id = NULL WHERE county_id IS NOT NULL;")
+            cur.execute("UPDATE warhammer_gamesession SET county_id = NULL WHERE county_id IS NOT NULL;")
+            cur.execute("UPDATE warhammer_gamesessionarchive SET county_id = NULL WHERE county_id IS NOT NULL;")
+            cur.execute("DELETE FROM warhammer_county;")
 
-                cur.execute(
-                    """
-                    INSERT INTO warhammer_county (name, province, geom)
-                    VALUES (
-                        %s,
-                        %s,
+            # transform every staged feature in a single statement
+            cur.execute(
+                """
+                INSERT INTO warhammer_county (name, province, geom)
+                SELECT
+                    name,
+                    province,
+                    ST_Multi(
                         ST_Transform(
                             ST_SetSRID(
-                                ST_GeomFromGeoJSON(%s),
+                                ST_GeomFromGeoJSON(geom),
                                 2157
                             ),
                             4326
                         )
-                    );
-                    """,
-                    [name, province, geom_json],
+                    )
+                FROM county_staging;
+                """
+            )
+            inserted = cur.rowcount
+
+            # precompute the simplified outlines served at lower zooms
+            cur.execute(
+                "UPDATE warhammer_county SET "
+                + ", ".join(
+                    f"{column} = {simplified_geom_sql('geom', tolerance)}"
+                    for column, tolerance, _ in BOUNDARY_DETAIL_LEVELS
                 )
-                inserted += 1
+                + ";"
+            )
+
+            # rebuild dissolved provinces, then reassign venues and (archived) sessions
+            call_command("build_provinces")
+            call_command("assign_counties")
+
+            BoundaryImport.objects.update_or_create(source=source, defaults={"checksum": checksum})
 
         self.stdout.write(self.style.SUCCESS(f"Inserted {inserted} counties (2157 → 4326) via PostGIS."))
+
+    # Stages a batch of (name, province, geojson) rows in one multi-row INSERT
+    def _stage(self, cur, rows):
+        placeholders = ", ".join(["(%s, %s, %s)"] * len(rows))
+        cur.execute(
+            f"INSERT INTO county_staging (name, province, geom) VALUES {placeholders};",
+            [value for row in rows for value in row],
+        )
+        return len(rows)
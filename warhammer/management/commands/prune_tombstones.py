@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from warhammer.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete tombstones older than SYNC_TOMBSTONE_DAYS. Sync tokens older than that "
+        "are refused, so those clients reload in full. Meant to run on a schedule."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=getattr(settings, "SYNC_TOMBSTONE_DAYS", 30),
+            help="Keep tombstones this many days (never less than SYNC_TOMBSTONE_DAYS)",
+        )
+
+    def handle(self, *args, **options):
+        # never prune inside the window the views still accept tokens for
+        days = max(options["days"], getattr(settings, "SYNC_TOMBSTONE_DAYS", 30))
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} tombstones older than {cutoff:%Y-%m-%d %H:%M}."))
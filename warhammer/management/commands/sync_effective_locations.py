@@ -0,0 +1,32 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+
+
+class Command(BaseCommand):
+    help = "Recompute every game session's effective location (own location, else its venue's) and county."
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), connection.cursor() as cur:
+            # only rows whose effective location changes are written
+            cur.execute(
+                """
+                WITH resolved AS (
+                    SELECT s.id, COALESCE(s.location, v.location) AS location
+                    FROM warhammer_gamesession s
+                    LEFT JOIN warhammer_venue v ON v.id = s.venue_id
+                )
+                UPDATE warhammer_gamesession s
+                SET effective_location = r.location
+                FROM resolved r
+                WHERE s.id = r.id
+                AND s.effective_location IS DISTINCT FROM r.location;
+                """
+            )
+            synced = cur.rowcount
+
+        self.stdout.write(self.style.SUCCESS(f"Updated the effective location of {synced} game sessions."))
+
+        # counties follow the effective location
+        call_command("assign_counties")
@@ -0,0 +1,117 @@
+"""
+Prometheus metrics for the API routes.
+Per-route request counters and histograms of latency, database time and
+response size. When PROMETHEUS_MULTIPROC_DIR is set (before the app is
+imported), every worker process writes its samples to that directory
+and /metrics aggregates them across workers.
+"""
+
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+from .instrumentation import RequestTiming, current_timing, start_timing, stop_timing
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+REQUESTS = Counter(
+    "warhammer_http_requests_total",
+    "API requests by route, method and status.",
+    ["route", "method", "status"],
+)
+LATENCY = Histogram(
+    "warhammer_http_request_duration_seconds",
+    "Request latency by route.",
+    ["route", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_TIME = Histogram(
+    "warhammer_http_request_db_seconds",
+    "Time spent in SQL per request, by route.",
+    ["route", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "warhammer_http_response_size_bytes",
+    "Response body size by route.",
+    ["route", "method"],
+    buckets=SIZE_BUCKETS,
+)
+
+
+# Route pattern (e.g. "api/sessions/in-bbox/") so labels stay low-cardinality
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    return match.route if match else "unmatched"
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        # reuse the instrumentation middleware's timings when it is enabled
+        timing = current_timing()
+        if timing is None:
+            timing = RequestTiming()
+            token = start_timing(timing)
+            try:
+                response = self.get_response(request)
+            finally:
+                stop_timing(token)
+        else:
+            response = self.get_response(request)
+        self._observe(request, response, timing, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        timing = current_timing()
+        if timing is None:
+            timing = RequestTiming()
+            token = start_timing(timing)
+            try:
+                response = await self.get_response(request)
+            finally:
+                stop_timing(token)
+        else:
+            response = await self.get_response(request)
+        self._observe(request, response, timing, time.perf_counter() - start)
+        return response
+
+    def _observe(self, request, response, timing, elapsed):
+        route = _route(request)
+        method = request.method
+        REQUESTS.labels(route, method, str(response.status_code)).inc()
+        LATENCY.labels(route, method).observe(elapsed)
+        DB_TIME.labels(route, method).observe(timing.sql_ms / 1000)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(route, method).observe(len(response.content))
+
+
+# Exposes metrics in Prometheus text format, aggregated across workers
+def metrics_view(request):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,52 @@
+# Generated by Django 4.2 on 2026-10-17 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Assign counties to the venues and sessions already stored, as the
+# assign_counties command does (sessions without a point use their venue's)
+COUNTY_FOR_POINT_SQL = """
+    SELECT c.id
+    FROM warhammer_county c
+    WHERE ST_Intersects(c.geom, {point})
+    ORDER BY ST_Covers(c.geom, {point}) DESC, c.id
+    LIMIT 1
+"""
+
+ASSIGN_COUNTIES = f"""
+UPDATE warhammer_venue v
+SET county_id = ({COUNTY_FOR_POINT_SQL.format(point="v.location")})
+WHERE v.location IS NOT NULL;
+
+UPDATE warhammer_gamesession s
+SET county_id = ({COUNTY_FOR_POINT_SQL.format(point="p.location")})
+FROM (
+    SELECT s2.id, COALESCE(s2.location, v.location) AS location
+    FROM warhammer_gamesession s2
+    LEFT JOIN warhammer_venue v ON v.id = s2.venue_id
+) p
+WHERE p.id = s.id
+AND p.location IS NOT NULL;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0006_county_province'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='county',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='venues', to='warhammer.county'),
+        ),
+        migrations.AddField(
+            model_name='gamesession',
+            name='county',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='games', to='warhammer.county'),
+        ),
+        migrations.RunSQL(ASSIGN_COUNTIES, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2 on 2026-10-17 10:03
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+# Dissolve the counties already loaded into provinces, as build_provinces
+# does (inlined so the migration does not depend on the command's code)
+BUILD_PROVINCES = """
+INSERT INTO warhammer_province (name, geom, geom_fine, geom_medium, geom_coarse)
+SELECT
+    name,
+    geom,
+    ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_SimplifyPreserveTopology(geom, 0.001)), 3)),
+    ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_SimplifyPreserveTopology(geom, 0.005)), 3)),
+    ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_SimplifyPreserveTopology(geom, 0.01)), 3))
+FROM (
+    SELECT
+        province AS name,
+        ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_Union(ST_MakeValid(geom))), 3)) AS geom
+    FROM warhammer_county
+    WHERE province IS NOT NULL AND province <> ''
+    GROUP BY province
+) dissolved;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0007_venue_county_gamesession_county'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Province',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('geom', django.contrib.gis.db.models.fields.MultiPolygonField(srid=4326)),
+                ('geom_fine', django.contrib.gis.db.models.fields.MultiPolygonField(blank=True, null=True, srid=4326)),
+                ('geom_medium', django.contrib.gis.db.models.fields.MultiPolygonField(blank=True, null=True, srid=4326)),
+                ('geom_coarse', django.contrib.gis.db.models.fields.MultiPolygonField(blank=True, null=True, srid=4326)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RunSQL(BUILD_PROVINCES, migrations.RunSQL.noop),
+    ]
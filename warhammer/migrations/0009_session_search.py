@@ -0,0 +1,82 @@
+# Generated by Django 4.2 on 2026-10-17 11:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# Keeps GameSession.search_vector in sync with the session and its venue name
+SEARCH_VECTOR_TRIGGERS = """
+CREATE OR REPLACE FUNCTION warhammer_gamesession_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(NEW.game_system, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(
+            (SELECT name FROM warhammer_venue WHERE id = NEW.venue_id), ''
+        )), 'B')
+        || setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER warhammer_gamesession_search_vector_trg
+BEFORE INSERT OR UPDATE OF title, description, game_system, venue_id
+ON warhammer_gamesession
+FOR EACH ROW EXECUTE FUNCTION warhammer_gamesession_search_vector();
+
+CREATE OR REPLACE FUNCTION warhammer_venue_name_search_vector() RETURNS trigger AS $$
+BEGIN
+    UPDATE warhammer_gamesession SET title = title WHERE venue_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER warhammer_venue_name_search_vector_trg
+AFTER UPDATE OF name ON warhammer_venue
+FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION warhammer_venue_name_search_vector();
+
+UPDATE warhammer_gamesession SET title = title;
+"""
+
+DROP_SEARCH_VECTOR_TRIGGERS = """
+DROP TRIGGER IF EXISTS warhammer_venue_name_search_vector_trg ON warhammer_venue;
+DROP FUNCTION IF EXISTS warhammer_venue_name_search_vector();
+DROP TRIGGER IF EXISTS warhammer_gamesession_search_vector_trg ON warhammer_gamesession;
+DROP FUNCTION IF EXISTS warhammer_gamesession_search_vector();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0008_province'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='gamesession',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='session_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='session_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['game_system'], name='session_system_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='venue_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_TRIGGERS, DROP_SEARCH_VECTOR_TRIGGERS),
+    ]
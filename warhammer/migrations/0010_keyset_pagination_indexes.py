@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-17 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0009_session_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=models.Index(fields=['start_time', 'id'], name='session_start_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['name', 'id'], name='venue_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-17 13:40
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+# Simplify the counties already loaded (load_counties does this on reload)
+SIMPLIFY_COUNTIES = """
+UPDATE warhammer_county SET
+    geom_coarse = ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_SimplifyPreserveTopology(geom, 0.01)), 3)),
+    geom_medium = ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_SimplifyPreserveTopology(geom, 0.005)), 3)),
+    geom_fine = ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_SimplifyPreserveTopology(geom, 0.001)), 3));
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0010_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='county',
+            name='geom_fine',
+            field=django.contrib.gis.db.models.fields.MultiPolygonField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='county',
+            name='geom_medium',
+            field=django.contrib.gis.db.models.fields.MultiPolygonField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='county',
+            name='geom_coarse',
+            field=django.contrib.gis.db.models.fields.MultiPolygonField(blank=True, null=True, srid=4326),
+        ),
+        migrations.RunSQL(SIMPLIFY_COUNTIES, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-17 14:25
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0011_county_simplified_geoms'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='effective_location',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, editable=False, null=True, srid=4326),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE warhammer_gamesession s
+            SET effective_location = COALESCE(
+                s.location,
+                (SELECT location FROM warhammer_venue WHERE id = s.venue_id)
+            );
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-17 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0012_gamesession_effective_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoundaryImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255, unique=True)),
+                ('checksum', models.CharField(max_length=64)),
+                ('loaded_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
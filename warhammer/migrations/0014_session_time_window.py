@@ -0,0 +1,49 @@
+# Generated by Django 4.2 on 2026-10-17 16:30
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0013_boundaryimport'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=models.Index(fields=['is_open', 'start_time'], name='session_open_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=models.Index(fields=['game_system', 'start_time'], name='session_system_start_idx'),
+        ),
+        migrations.CreateModel(
+            name='GameSessionArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('game_system', models.CharField(max_length=100)),
+                ('points_level', models.CharField(blank=True, max_length=50)),
+                ('organiser', models.CharField(max_length=100)),
+                ('organiser_contact', models.CharField(blank=True, max_length=100)),
+                ('start_time', models.DateTimeField()),
+                ('max_players', models.PositiveIntegerField()),
+                ('current_players', models.PositiveIntegerField()),
+                ('location', django.contrib.gis.db.models.fields.PointField(blank=True, null=True, srid=4326)),
+                ('effective_location', django.contrib.gis.db.models.fields.PointField(blank=True, null=True, srid=4326)),
+                ('is_open', models.BooleanField()),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('county', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='warhammer.county')),
+                ('venue', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='warhammer.venue')),
+            ],
+            options={
+                'ordering': ['-start_time'],
+                'indexes': [models.Index(fields=['start_time'], name='archive_start_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2 on 2026-10-17 18:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+# Stamps updated_at on every write, and records deleted ids as tombstones
+# (statement level, so bulk deletes insert their tombstones in one go)
+DELTA_SYNC_TRIGGERS = """
+CREATE OR REPLACE FUNCTION warhammer_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER warhammer_gamesession_updated_at_trg
+BEFORE INSERT OR UPDATE ON warhammer_gamesession
+FOR EACH ROW EXECUTE FUNCTION warhammer_touch_updated_at();
+
+CREATE TRIGGER warhammer_venue_updated_at_trg
+BEFORE INSERT OR UPDATE ON warhammer_venue
+FOR EACH ROW EXECUTE FUNCTION warhammer_touch_updated_at();
+
+CREATE OR REPLACE FUNCTION warhammer_record_tombstones() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO warhammer_tombstone (model, object_id, deleted_at)
+    SELECT TG_ARGV[0], id, now() FROM deleted_rows;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER warhammer_gamesession_tombstone_trg
+AFTER DELETE ON warhammer_gamesession
+REFERENCING OLD TABLE AS deleted_rows
+FOR EACH STATEMENT EXECUTE FUNCTION warhammer_record_tombstones('session');
+
+CREATE TRIGGER warhammer_venue_tombstone_trg
+AFTER DELETE ON warhammer_venue
+REFERENCING OLD TABLE AS deleted_rows
+FOR EACH STATEMENT EXECUTE FUNCTION warhammer_record_tombstones('venue');
+"""
+
+DROP_DELTA_SYNC_TRIGGERS = """
+DROP TRIGGER IF EXISTS warhammer_venue_tombstone_trg ON warhammer_venue;
+DROP TRIGGER IF EXISTS warhammer_gamesession_tombstone_trg ON warhammer_gamesession;
+DROP FUNCTION IF EXISTS warhammer_record_tombstones();
+DROP TRIGGER IF EXISTS warhammer_venue_updated_at_trg ON warhammer_venue;
+DROP TRIGGER IF EXISTS warhammer_gamesession_updated_at_trg ON warhammer_gamesession;
+DROP FUNCTION IF EXISTS warhammer_touch_updated_at();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0014_session_time_window'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('venue', 'Venue'), ('session', 'Game session')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['model', 'deleted_at'], name='tombstone_model_deleted_idx')],
+            },
+        ),
+        migrations.RunSQL(DELTA_SYNC_TRIGGERS, DROP_DELTA_SYNC_TRIGGERS),
+    ]
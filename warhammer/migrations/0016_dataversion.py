@@ -0,0 +1,61 @@
+# Generated by Django 4.2 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+# One statement-level trigger per table bumps the "data" counter, so bulk
+# writes bump it once; the counter row is seeded from the clock so a fresh
+# database never reuses a version an external cache may still hold
+DATA_VERSION_TRIGGERS = """
+INSERT INTO warhammer_dataversion (name, version)
+VALUES ('data', (extract(epoch FROM now()) * 1000)::bigint);
+
+CREATE OR REPLACE FUNCTION warhammer_bump_data_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE warhammer_dataversion SET version = version + 1 WHERE name = TG_ARGV[0];
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER warhammer_venue_data_version_trg
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON warhammer_venue
+FOR EACH STATEMENT EXECUTE FUNCTION warhammer_bump_data_version('data');
+
+CREATE TRIGGER warhammer_gamesession_data_version_trg
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON warhammer_gamesession
+FOR EACH STATEMENT EXECUTE FUNCTION warhammer_bump_data_version('data');
+
+CREATE TRIGGER warhammer_county_data_version_trg
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON warhammer_county
+FOR EACH STATEMENT EXECUTE FUNCTION warhammer_bump_data_version('data');
+
+CREATE TRIGGER warhammer_province_data_version_trg
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON warhammer_province
+FOR EACH STATEMENT EXECUTE FUNCTION warhammer_bump_data_version('data');
+"""
+
+DROP_DATA_VERSION_TRIGGERS = """
+DROP TRIGGER IF EXISTS warhammer_province_data_version_trg ON warhammer_province;
+DROP TRIGGER IF EXISTS warhammer_county_data_version_trg ON warhammer_county;
+DROP TRIGGER IF EXISTS warhammer_gamesession_data_version_trg ON warhammer_gamesession;
+DROP TRIGGER IF EXISTS warhammer_venue_data_version_trg ON warhammer_venue;
+DROP FUNCTION IF EXISTS warhammer_bump_data_version();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0015_delta_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('name', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(DATA_VERSION_TRIGGERS, DROP_DATA_VERSION_TRIGGERS),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-18 09:40
+
+from django.db import migrations
+
+
+# The county index rebuilds when this counter moves, so every process
+# picks up boundaries reloaded by load_counties in another process
+BOUNDARY_VERSION_TRIGGER = """
+INSERT INTO warhammer_dataversion (name, version)
+VALUES ('boundary', (extract(epoch FROM now()) * 1000)::bigint);
+
+CREATE TRIGGER warhammer_county_boundary_version_trg
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON warhammer_county
+FOR EACH STATEMENT EXECUTE FUNCTION warhammer_bump_data_version('boundary');
+"""
+
+DROP_BOUNDARY_VERSION_TRIGGER = """
+DROP TRIGGER IF EXISTS warhammer_county_boundary_version_trg ON warhammer_county;
+DELETE FROM warhammer_dataversion WHERE name = 'boundary';
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0016_dataversion'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BOUNDARY_VERSION_TRIGGER, DROP_BOUNDARY_VERSION_TRIGGER),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-18 11:20
+
+from django.db import migrations
+
+
+# Splits the updated_at triggers so updates only stamp rows that actually
+# changed (WHEN with OLD is not allowed on INSERT triggers). Updates that
+# rewrite a row with the same values leave updated_at alone, so delta sync
+# does not resend them
+UPDATED_AT_WHEN_CHANGED = """
+DROP TRIGGER IF EXISTS warhammer_gamesession_updated_at_trg ON warhammer_gamesession;
+DROP TRIGGER IF EXISTS warhammer_venue_updated_at_trg ON warhammer_venue;
+
+CREATE TRIGGER warhammer_gamesession_updated_at_trg
+BEFORE INSERT ON warhammer_gamesession
+FOR EACH ROW EXECUTE FUNCTION warhammer_touch_updated_at();
+
+CREATE TRIGGER warhammer_gamesession_updated_at_update_trg
+BEFORE UPDATE ON warhammer_gamesession
+FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+EXECUTE FUNCTION warhammer_touch_updated_at();
+
+CREATE TRIGGER warhammer_venue_updated_at_trg
+BEFORE INSERT ON warhammer_venue
+FOR EACH ROW EXECUTE FUNCTION warhammer_touch_updated_at();
+
+CREATE TRIGGER warhammer_venue_updated_at_update_trg
+BEFORE UPDATE ON warhammer_venue
+FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+EXECUTE FUNCTION warhammer_touch_updated_at();
+"""
+
+UPDATED_AT_ALWAYS = """
+DROP TRIGGER IF EXISTS warhammer_venue_updated_at_update_trg ON warhammer_venue;
+DROP TRIGGER IF EXISTS warhammer_venue_updated_at_trg ON warhammer_venue;
+DROP TRIGGER IF EXISTS warhammer_gamesession_updated_at_update_trg ON warhammer_gamesession;
+DROP TRIGGER IF EXISTS warhammer_gamesession_updated_at_trg ON warhammer_gamesession;
+
+CREATE TRIGGER warhammer_gamesession_updated_at_trg
+BEFORE INSERT OR UPDATE ON warhammer_gamesession
+FOR EACH ROW EXECUTE FUNCTION warhammer_touch_updated_at();
+
+CREATE TRIGGER warhammer_venue_updated_at_trg
+BEFORE INSERT OR UPDATE ON warhammer_venue
+FOR EACH ROW EXECUTE FUNCTION warhammer_touch_updated_at();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0017_boundary_version'),
+    ]
+
+    operations = [
+        migrations.RunSQL(UPDATED_AT_WHEN_CHANGED, UPDATED_AT_ALWAYS),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-18 12:05
+
+from django.db import migrations
+
+
+# Province outlines are cached on the boundary version, so rebuilding them
+# (build_provinces) moves it too
+PROVINCE_BOUNDARY_VERSION_TRIGGER = """
+CREATE TRIGGER warhammer_province_boundary_version_trg
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON warhammer_province
+FOR EACH STATEMENT EXECUTE FUNCTION warhammer_bump_data_version('boundary');
+"""
+
+DROP_PROVINCE_BOUNDARY_VERSION_TRIGGER = """
+DROP TRIGGER IF EXISTS warhammer_province_boundary_version_trg ON warhammer_province;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warhammer', '0018_updated_at_when_changed'),
+    ]
+
+    operations = [
+        migrations.RunSQL(PROVINCE_BOUNDARY_VERSION_TRIGGER, DROP_PROVINCE_BOUNDARY_VERSION_TRIGGER),
+    ]
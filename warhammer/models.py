@@ -4,9 +4,16 @@ Each model represents an entity used on the map:
 - Venue: a location that can host games.
 - GameSession: Warhammer session with spatial data and filters.
 - County: Irish county boundaries for province-based filtering.
+- Province: dissolved province boundaries built from the counties.
+- BoundaryImport: checksum of the last boundary file loaded.
+- GameSessionArchive: past sessions moved out of the live table.
+- Tombstone: ids of deleted venues and sessions, for delta sync.
+- DataVersion: change counters keying the map data cache.
 """
 
 from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 
 #physical venue or game store where a game can be played
@@ -15,8 +22,39 @@ class Venue(models.Model):
     description = models.TextField(blank=True)
     location = models.PointField(srid=4326, null=True, blank=True)
 
+    # county containing the location, assigned on save
+    county = models.ForeignKey(
+        "County",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="venues"
+    )
+
+    # set on every insert and update, including raw SQL writes, by a
+    # database trigger (see migration 0015)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
     class Meta:
-        indexes = [models.Index(fields=["location"])]
+        indexes = [
+            models.Index(fields=["location"]),
+            models.Index(fields=["name", "id"], name="venue_name_id_idx"),
+            GinIndex(fields=["name"], name="venue_name_trgm", opclasses=["gin_trgm_ops"]),
+        ]
+
+    # Assigns the county from the location; when the venue moves, sessions
+    # without a location of their own move with it
+    def save(self, *args, **kwargs):
+        old_location = None
+        if self.pk:
+            old_location = Venue.objects.filter(pk=self.pk).values_list("location", flat=True).first()
+        self.county = County.for_point(self.location) if self.location else None
+        super().save(*args, **kwargs)
+
+        if old_location != self.location:
+            self.games.filter(location__isnull=True).update(
+                effective_location=self.location, county=self.county
+            )
 
     def __str__(self):
         return self.name
@@ -45,7 +83,11 @@ class GameSession(models.Model):
     # Spatial point
     location = models.PointField(srid=4326, null=True, blank=True)
 
-    # can be set in a Venue (copies its location)
+    # Where the session is shown and queried: its own location, or its
+    # venue's when it has none (maintained on save and when the venue moves)
+    effective_location = models.PointField(srid=4326, null=True, blank=True, editable=False)
+
+    # can be set in a Venue (its location is used when the session has none)
     venue = models.ForeignKey(
         "Venue",
         on_delete=models.SET_NULL,
@@ -54,20 +96,43 @@ class GameSession(models.Model):
         related_name="games"
     )
 
+    # county containing the effective location, assigned on save
+    county = models.ForeignKey(
+        "County",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="games"
+    )
+
     is_open = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # set on every insert and update, including raw SQL writes, by a
+    # database trigger (see migration 0015)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    # title, system, venue name and description; kept up to date by a
+    # database trigger (see migration 0009)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["start_time"]
         indexes = [
             models.Index(fields=["location"]),
-            models.Index(fields=["venue"])
+            models.Index(fields=["venue"]),
+            models.Index(fields=["start_time", "id"], name="session_start_id_idx"),
+            models.Index(fields=["is_open", "start_time"], name="session_open_start_idx"),
+            models.Index(fields=["game_system", "start_time"], name="session_system_start_idx"),
+            GinIndex(fields=["search_vector"], name="session_search_vector_gin"),
+            GinIndex(fields=["title"], name="session_title_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["game_system"], name="session_system_trgm", opclasses=["gin_trgm_ops"]),
         ]
 
-    # Automatically sets location to the venue’s if not defined
+    # Keeps the effective location (own location, else the venue's) and
+    # county in step; the venue's point is not copied into location
     def save(self, *args, **kwargs):
-        if self.venue and self.venue.location and not self.location:
-            self.location = self.venue.location
+        self.effective_location = self.location or (self.venue.location if self.venue else None)
+        self.county = County.for_point(self.effective_location) if self.effective_location else None
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -79,6 +144,101 @@ class County(models.Model):
     name = models.CharField(max_length=100)
     province = models.CharField(max_length=50, blank=True, null=True)
     geom = models.MultiPolygonField(srid=4326)
+    # ~100m, ~500m and ~1km simplified outlines (computed by load_counties)
+    geom_fine = models.MultiPolygonField(srid=4326, null=True, blank=True)
+    geom_medium = models.MultiPolygonField(srid=4326, null=True, blank=True)
+    geom_coarse = models.MultiPolygonField(srid=4326, null=True, blank=True)
+
+    # Returns the county covering a point, falling back to boundary intersection
+    @classmethod
+    def for_point(cls, point):
+        county = cls.objects.filter(geom__covers=point).first()
+        if not county:
+            county = cls.objects.filter(geom__intersects=point).first()
+        return county
+
+    def __str__(self):
+        return self.name
+
+
+# Stores one dissolved boundary per province, plus simplified variants
+# (built from County by the build_provinces command)
+class Province(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    geom = models.MultiPolygonField(srid=4326)
+    # ~100m, ~500m and ~1km simplification tolerances
+    geom_fine = models.MultiPolygonField(srid=4326, null=True, blank=True)
+    geom_medium = models.MultiPolygonField(srid=4326, null=True, blank=True)
+    geom_coarse = models.MultiPolygonField(srid=4326, null=True, blank=True)
+
+    class Meta:
+        ordering = ["name"]
 
     def __str__(self):
         return self.name
+
+
+# Records which boundary file was last loaded, so unchanged reloads are skipped
+class BoundaryImport(models.Model):
+    source = models.CharField(max_length=255, unique=True)
+    checksum = models.CharField(max_length=64)
+    loaded_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.source
+
+
+# Past sessions moved out of the live table by the archive_sessions command
+# (keeps the original id)
+class GameSessionArchive(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    game_system = models.CharField(max_length=100)
+    points_level = models.CharField(max_length=50, blank=True)
+    organiser = models.CharField(max_length=100)
+    organiser_contact = models.CharField(max_length=100, blank=True)
+    start_time = models.DateTimeField()
+    max_players = models.PositiveIntegerField()
+    current_players = models.PositiveIntegerField()
+    location = models.PointField(srid=4326, null=True, blank=True)
+    effective_location = models.PointField(srid=4326, null=True, blank=True)
+    venue = models.ForeignKey("Venue", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    county = models.ForeignKey("County", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    is_open = models.BooleanField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-start_time"]
+        indexes = [models.Index(fields=["start_time"], name="archive_start_idx")]
+
+    def __str__(self):
+        return self.title
+
+
+# One row per deleted venue or session, written by a database trigger (so
+# raw SQL deletes are recorded too) and pruned by prune_tombstones
+class Tombstone(models.Model):
+    MODEL_CHOICES = [("venue", "Venue"), ("session", "Game session")]
+
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["model", "deleted_at"], name="tombstone_model_deleted_idx")]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
+
+
+# Change counters keying the map data cache and ETags. Bumped by database
+# triggers on every write (see migration 0016), so changes made by raw SQL,
+# management commands and other worker processes are all seen
+class DataVersion(models.Model):
+    name = models.CharField(max_length=20, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} {self.version}"
@@ -0,0 +1,146 @@
+"""
+Keyset (cursor) pagination for the session and venue list endpoints.
+A cursor holds the ordering key of the row it starts after, and the next
+page is fetched with WHERE (k1 > v1) OR (k1 = v1 AND k2 > v2) ..., so deep
+pages cost the same as the first one and rows added or removed between
+requests never shift a page. Cursors are opaque to clients.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    # ordering key, most significant first; the last field must be unique
+    ordering = ("id",)
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request)
+
+        if values is not None:
+            queryset = queryset.filter(self.after(values, reverse))
+        # one extra row tells whether there is a page beyond this one
+        rows = list(queryset.order_by(*self.order_by(reverse))[:size + 1])
+        more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        has_next = (more and not reverse) or (reverse and values is not None)
+        has_previous = (more and reverse) or (not reverse and values is not None)
+        self.next_key = self.key(rows[-1]) if rows and has_next else None
+        self.previous_key = self.key(rows[0]) if rows and has_previous else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_link(self.next_key, reverse=False),
+            "previous": self.get_link(self.previous_key, reverse=True),
+            "results": data,
+        })
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    # (field, descending) pairs of the ordering key
+    def fields(self):
+        return [(field.lstrip("-"), field.startswith("-")) for field in self.ordering]
+
+    def order_by(self, reverse):
+        return [f"-{name}" if descending != reverse else name for name, descending in self.fields()]
+
+    # Rows strictly after the key in page order (strictly before when reversed)
+    def after(self, values, reverse):
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.fields(), values):
+            lookup = "lt" if descending != reverse else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def key(self, row):
+        return [getattr(row, name) for name, _ in self.fields()]
+
+    # Cursors are base64 JSON: the key values and the direction
+    def get_link(self, values, reverse):
+        if values is None:
+            return None
+        payload = json.dumps({
+            "k": [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values],
+            "r": int(reverse),
+        })
+        cursor = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(raw.encode("ascii")))
+            values = payload["k"]
+            if len(values) != len(self.ordering):
+                raise ValueError(values)
+            values = [self.to_python(name, value) for (name, _), value in zip(self.fields(), values)]
+            return values, bool(payload["r"])
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    # Model fields parse their own values (e.g. datetimes); annotations
+    # such as the search rank are plain numbers
+    def to_python(self, name, value):
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            if not isinstance(value, (int, float)):
+                raise ValueError(value)
+            return value
+        return field.to_python(value)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {"name": self.cursor_query_param, "required": False, "in": "query", "schema": {"type": "string"}},
+            {"name": self.page_size_query_param, "required": False, "in": "query", "schema": {"type": "integer"}},
+        ]
+
+
+# Pages sessions by (start_time, id)
+class SessionCursorPagination(KeysetPagination):
+    ordering = ("start_time", "id")
+
+
+# Pages search results by relevance as _search_sessions ranks them, with
+# id as the tie-breaker
+class SessionSearchCursorPagination(SessionCursorPagination):
+    ordering = ("-rank", "-similarity", "start_time", "id")
+
+
+# Pages venues by (name, id)
+class VenueCursorPagination(KeysetPagination):
+    ordering = ("name", "id")
@@ -0,0 +1,37 @@
+"""
+Binary output for the map endpoints, chosen by content negotiation
+(Accept: application/vnd.mapbox-vector-tile, or ?format=mvt).
+The views build the tile in PostGIS; this renderer only registers the
+media type with DRF and renders error bodies as JSON.
+"""
+
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+
+class VectorTileRenderer(BaseRenderer):
+    media_type = "application/vnd.mapbox-vector-tile"
+    format = "mvt"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytes(data)
+        # errors keep their JSON body
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["Content-Type"] = "application/json"
+        return json.dumps(data).encode("utf-8")
+
+
+# Renderers for endpoints that can answer in GeoJSON or as a vector tile
+MAP_RENDERERS = [*api_settings.DEFAULT_RENDERER_CLASSES, VectorTileRenderer]
+
+
+# True when the client negotiated the vector tile encoding
+def wants_vector_tile(request):
+    renderer = getattr(request, "accepted_renderer", None)
+    return getattr(renderer, "format", None) == VectorTileRenderer.format
@@ -0,0 +1,59 @@
+"""
+Publishes session changes to live map subscribers, and keeps sessions'
+effective locations in step when their venue is deleted. (The map data
+and boundary versions are bumped by database triggers.)
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .live import publish_change, session_event, session_state
+from .models import GameSession, Venue
+from .views import session_queryset_to_geojson
+
+
+def _session_province(session):
+    return session.county.province if session.county_id else None
+
+
+# Remembers a session's state before the save, for the live diff
+@receiver(pre_save, sender=GameSession)
+def session_before_save(sender, instance, raw=False, **kwargs):
+    instance._live_before = None
+    if raw or not instance.pk:
+        return
+    previous = (
+        GameSession.objects.filter(pk=instance.pk)
+        .select_related("county")
+        .only("effective_location", "game_system", "is_open", "county", "county__province")
+        .first()
+    )
+    if previous:
+        instance._live_before = session_state(previous, _session_province(previous))
+
+
+@receiver(post_save, sender=GameSession)
+def session_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    features = session_queryset_to_geojson([instance])["features"]
+    publish_change(session_event(
+        instance.pk,
+        getattr(instance, "_live_before", None),
+        session_state(instance, _session_province(instance)),
+        features[0] if features else None,
+    ))
+
+
+@receiver(post_delete, sender=GameSession)
+def session_deleted(sender, instance, **kwargs):
+    before = session_state(instance, _session_province(instance))
+    publish_change(session_event(instance.pk, before, None))
+
+
+# Deleting a venue nulls its sessions' venue in a bulk UPDATE, which skips
+# GameSession.save; sessions shown at the venue's point lose it here (runs
+# for Venue.delete and QuerySet.delete, in the same transaction)
+@receiver(pre_delete, sender=Venue)
+def venue_deleted(sender, instance, **kwargs):
+    instance.games.filter(location__isnull=True).update(effective_location=None, county=None)
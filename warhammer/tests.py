@@ -0,0 +1,262 @@
+"""
+Tests for the map data endpoints. They need a PostGIS test database
+(python manage.py test warhammer).
+"""
+
+import json
+import math
+from urllib.parse import urlencode
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.gis.geos import Point
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+import mapbox_vector_tile
+
+from .models import GameSession, Venue
+from .serializers import GameSessionSerializer
+from .views import filtered_sessions, session_queryset_to_geojson, session_queryset_to_geojson_sql, sessions_search
+
+
+# Sessions used by the map endpoint tests: two in the Dublin z7 tile
+# (61, 41), one in Cork and one in Galway outside it
+def create_sessions():
+    base = datetime(2026, 11, 7, 18, 0, tzinfo=dt_timezone.utc)
+    dublin = Venue.objects.create(name="Gamers Guild Dublin", location=Point(-6.2603, 53.3498, srid=4326))
+    cork = Venue.objects.create(name="Cork Wargames Club", location=Point(-8.4756, 51.8985, srid=4326))
+    sessions = [
+        ("Warhammer 40k league night", "Warhammer 40,000", dublin, None, 3),
+        ("Age of Sigmar doubles", "Age of Sigmar", cork, None, 1),
+        ("Kill Team open play", "Kill Team", None, Point(-9.0568, 53.2707, srid=4326), 2),
+        ("Warhammer 40k narrative", "Warhammer 40,000", cork, None, 0),
+        # own point, away from its venue's
+        ("Horus Heresy weekender", "Horus Heresy", dublin, Point(-6.3, 53.4, srid=4326), 4),
+    ]
+    for title, system, venue, location, days in sessions:
+        GameSession.objects.create(
+            title=title,
+            description=f"{title} – all welcome",
+            game_system=system,
+            points_level="2000pts",
+            organiser="Aoife",
+            organiser_contact="aoife@example.com",
+            # one start time with milliseconds, for the timestamp format
+            start_time=base + timedelta(days=days, milliseconds=250 if days == 2 else 0),
+            venue=venue,
+            location=location,
+        )
+
+
+# The SQL GeoJSON engine must produce the same features, in the same order,
+# as the Python fallback and the REST serializer
+class SessionGeoJSONParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_sessions()
+
+    def assertSameFeatures(self, qs):
+        python = json.loads(json.dumps(session_queryset_to_geojson(qs), cls=DjangoJSONEncoder))
+        sql = json.loads(session_queryset_to_geojson_sql(qs))
+        self.assertEqual(sql, python)
+
+        serialized_ids = [row["id"] for row in GameSessionSerializer(qs, many=True).data]
+        self.assertEqual([f["properties"]["id"] for f in sql["features"]], serialized_ids)
+        return sql["features"]
+
+    def test_all_sessions(self):
+        features = self.assertSameFeatures(GameSession.objects.select_related("venue").all())
+        self.assertEqual(len(features), 5)
+
+    def test_filtered_and_reordered(self):
+        qs = filtered_sessions({"system": "Warhammer 40,000"}).order_by("-start_time")
+        features = self.assertSameFeatures(qs)
+        self.assertEqual([f["properties"]["title"] for f in features], [
+            "Warhammer 40k league night",
+            "Warhammer 40k narrative",
+        ])
+
+    def test_search_ranking_order(self):
+        qs = filtered_sessions({"q": "Wahammer"})
+        features = self.assertSameFeatures(qs)
+        self.assertTrue(features)
+
+
+# Sessions shown at their venue's point leave the map with the venue
+class VenueDeleteTests(TestCase):
+    def test_sessions_without_a_point_lose_the_venue_location(self):
+        create_sessions()
+        dublin = Venue.objects.get(name="Gamers Guild Dublin")
+        dublin.delete()
+
+        inherited = GameSession.objects.get(title="Warhammer 40k league night")
+        self.assertIsNone(inherited.venue)
+        self.assertIsNone(inherited.effective_location)
+        self.assertIsNone(inherited.county)
+        own_point = GameSession.objects.get(title="Horus Heresy weekender")
+        self.assertEqual(own_point.effective_location, own_point.location)
+
+
+# Search results page on (rank, similarity, start_time, id); cursors must
+# carry the ranks exactly, or tied rows repeat or go missing
+class SessionSearchPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        base = datetime(2026, 11, 7, 18, 0, tzinfo=dt_timezone.utc)
+        for i in range(7):
+            GameSession.objects.create(
+                title="Kill Team league",
+                game_system="Kill Team",
+                organiser="Aoife",
+                # pairs of equal start times, so id breaks the ties too
+                start_time=base + timedelta(days=i // 2),
+            )
+
+    def test_pages_through_tied_ranks(self):
+        factory = RequestFactory()
+        url = "/search/?" + urlencode({"q": "kill team", "page_size": 2})
+        seen = []
+        for _ in range(10):
+            response = sessions_search(factory.get(url))
+            self.assertEqual(response.status_code, 200)
+            seen += [row["id"] for row in response.data["results"]]
+            if not response.data["next"]:
+                break
+            url = response.data["next"]
+        else:
+            self.fail("next link never ran out")
+
+        expected = list(GameSession.objects.order_by("start_time", "id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+
+# Web mercator bounds (west, south, size) of a z/x/y tile, in metres
+def tile_bounds(z, x, y):
+    half = math.pi * 6378137
+    size = 2 * half / 2 ** z
+    return -half + x * size, half - (y + 1) * size, size
+
+
+# The same bounds as (west, south, east, north) in degrees
+def tile_lnglat_bounds(z, x, y):
+    west, south, size = tile_bounds(z, x, y)
+    lng = lambda mx: math.degrees(mx / 6378137)  # noqa: E731
+    lat = lambda my: math.degrees(2 * math.atan(math.exp(my / 6378137)) - math.pi / 2)  # noqa: E731
+    return lng(west), lat(south), lng(west + size), lat(south + size)
+
+
+# A lng/lat point in tile units, y up (as mapbox_vector_tile decodes them)
+def tile_coordinates(lng, lat, z, x, y, extent):
+    west, south, size = tile_bounds(z, x, y)
+    mx = math.radians(lng) * 6378137
+    my = math.log(math.tan(math.pi / 4 + math.radians(lat) / 2)) * 6378137
+    return (mx - west) / size * extent, (my - south) / size * extent
+
+
+# The vector tile must carry the same sessions as the GeoJSON endpoint for
+# the tile's bounds
+class SessionTileRoundTripTests(TestCase):
+    TILE = (7, 61, 41)
+
+    @classmethod
+    def setUpTestData(cls):
+        create_sessions()
+
+    def geojson_for_tile(self, **params):
+        west, south, east, north = tile_lnglat_bounds(*self.TILE)
+        response = self.client.get(reverse("sessions-in-bbox"), {
+            "west": west, "south": south, "east": east, "north": north, **params,
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json()["features"]
+
+    def decoded_tile(self, **params):
+        response = self.client.get(reverse("sessions-tile", args=self.TILE), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/vnd.mapbox-vector-tile")
+        layer = mapbox_vector_tile.decode(response.content).get("sessions", {"features": [], "extent": 4096})
+        return layer["features"], layer["extent"]
+
+    def assertTileMatchesGeoJSON(self, **params):
+        expected = {f["properties"]["id"]: f for f in self.geojson_for_tile(**params)}
+        features, extent = self.decoded_tile(**params)
+        self.assertEqual(len(features), len(expected))
+
+        for feature in features:
+            props = feature["properties"]
+            self.assertIn(props["id"], expected)
+            geojson = expected[props["id"]]
+            for key in ("title", "game_system", "is_open", "current_players", "max_players", "venue_name"):
+                self.assertEqual(props.get(key), geojson["properties"].get(key), key)
+
+            # ST_AsMVTGeom snaps to the tile grid: allow one unit
+            lng, lat = geojson["geometry"]["coordinates"]
+            tx, ty = tile_coordinates(lng, lat, *self.TILE, extent)
+            px, py = feature["geometry"]["coordinates"]
+            self.assertAlmostEqual(px, tx, delta=1)
+            self.assertAlmostEqual(py, ty, delta=1)
+        return features
+
+    def test_tile_matches_geojson(self):
+        features = self.assertTileMatchesGeoJSON()
+        self.assertEqual(
+            sorted(f["properties"]["title"] for f in features),
+            ["Horus Heresy weekender", "Warhammer 40k league night"],
+        )
+
+    def test_filtered_tile_matches_geojson(self):
+        features = self.assertTileMatchesGeoJSON(system="Horus Heresy")
+        self.assertEqual(len(features), 1)
+
+
+# ?format=mvt on the map endpoints must return the same features as their
+# GeoJSON: every property, the order, and coordinates to the ~0.6m grid of
+# the 2^26-extent world tile
+class WorldVectorTileTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_sessions()
+        Venue.objects.create(name="Galway Dice Tower", location=Point(-9.0568, 53.2707, srid=4326))
+
+    def assertTileMatchesGeoJSON(self, name, layer_name, params=None):
+        params = params or {}
+        geojson = self.client.get(reverse(name), params)
+        self.assertEqual(geojson.status_code, 200)
+        expected = geojson.json()["features"]
+
+        response = self.client.get(reverse(name), {**params, "format": "mvt"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/vnd.mapbox-vector-tile")
+        layer = mapbox_vector_tile.decode(response.content)[layer_name]
+        self.assertEqual(layer["extent"], 1 << 26)
+
+        features = layer["features"]
+        self.assertEqual([f["properties"]["id"] for f in features], [f["properties"]["id"] for f in expected])
+        for feature, geo in zip(features, expected):
+            self.assertEqual(feature["properties"], geo["properties"])
+            # one unit of the world tile is ~0.6m of web mercator
+            lng, lat = geo["geometry"]["coordinates"]
+            tx, ty = tile_coordinates(lng, lat, 0, 0, 0, layer["extent"])
+            px, py = feature["geometry"]["coordinates"]
+            self.assertAlmostEqual(px, tx, delta=1)
+            self.assertAlmostEqual(py, ty, delta=1)
+        return features
+
+    def test_sessions_geojson(self):
+        features = self.assertTileMatchesGeoJSON("sessions-geojson", "sessions")
+        self.assertEqual(len(features), 5)
+        # start_time (with milliseconds) and description come through as text
+        self.assertIn("2026-11-09T18:00:00.250Z", [f["properties"]["start_time"] for f in features])
+
+    def test_sessions_geojson_search_order(self):
+        self.assertTileMatchesGeoJSON("sessions-geojson", "sessions", {"q": "Wahammer"})
+
+    def test_sessions_in_bbox(self):
+        features = self.assertTileMatchesGeoJSON(
+            "sessions-in-bbox", "sessions", {"west": -10.7, "south": 51.3, "east": -5.4, "north": 53.3},
+        )
+        self.assertEqual(len(features), 3)
+
+    def test_venues_geojson(self):
+        features = self.assertTileMatchesGeoJSON("venues-geojson", "venues")
+        self.assertEqual(len(features), 3)
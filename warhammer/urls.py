@@ -3,7 +3,7 @@ Maps all API and page endpoints for the Warhammer Game Finder app.
 """
 
 from django.urls import path
-from warhammer import views
+from warhammer import async_views, views
 
 urlpatterns = [
     path("", views.map_view, name="map"),
@@ -13,9 +13,21 @@ urlpatterns = [
     path("venues/<int:pk>/", views.VenueDetailView.as_view(), name="venue-detail"),
     path("sessions/geojson/", views.sessions_geojson, name="sessions-geojson"),
     path("sessions/in-bbox/", views.sessions_in_bbox, name="sessions-in-bbox"),
+    path("sessions/tiles/<int:z>/<int:x>/<int:y>.mvt", views.sessions_tile, name="sessions-tile"),
     path("sessions/nearest/", views.sessions_nearest, name="sessions-nearest"),
+    path("sessions/batch/", views.sessions_batch, name="sessions-batch"),
+    path("sessions/facets/", views.sessions_facets, name="sessions-facets"),
     path("sessions/distinct-systems/", views.sessions_distinct_systems, name="sessions-distinct-systems"),
     path("venues/geojson/", views.venues_geojson, name="venues-geojson"),
     path("counties/for-point/", views.county_for_point, name="county-for-point"),
+    path("counties/geojson/", views.counties_geojson, name="counties-geojson"),
+    path("provinces/geojson/", views.provinces_geojson, name="provinces-geojson"),
     path("counties/distinct-provinces/", views.distinct_provinces, name="counties-distinct-provinces"),
+
+    # async read-only map endpoints, served by the ASGI app
+    path("async/sessions/geojson/", async_views.sessions_geojson, name="async-sessions-geojson"),
+    path("async/sessions/in-bbox/", async_views.sessions_in_bbox, name="async-sessions-in-bbox"),
+    path("async/venues/geojson/", async_views.venues_geojson, name="async-venues-geojson"),
+    path("async/counties/for-point/", async_views.county_for_point, name="async-county-for-point"),
+    path("async/sessions/live/", async_views.sessions_live, name="async-sessions-live"),
 ]
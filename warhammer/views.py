@@ -4,20 +4,37 @@ Includes REST views for sessions and venues, GeoJSON responses for the map,
 and spatial queries using PostGIS functions (bbox, nearest, province filter).
 """
 
+import hashlib
+import json
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
 from django.shortcuts import render
-from django.http import JsonResponse
-from django.db import models
-from django.contrib.gis.geos import Point, Polygon
-from django.contrib.gis.db.models.functions import Distance
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_date, parse_datetime
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.db import connection, models
+from django.contrib.gis.db.models import PolygonField
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models.functions import Cast, Greatest, RowNumber
 from django.views.decorators.csrf import csrf_exempt
 
 from rest_framework import generics, status
-from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, renderer_classes
 from rest_framework.response import Response
 
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
 
-from .models import GameSession, Venue, County
+from .cache import cached_by_boundary_version, cached_by_data_version, data_version, map_data_cache
+from .counties import boundary_column_for_zoom, county_index
+from .instrumentation import timed_json_response, timed_serialization
+from .models import GameSession, Venue, County, Province, Tombstone
+from .pagination import SessionCursorPagination, SessionSearchCursorPagination, VenueCursorPagination
+from .renderers import MAP_RENDERERS, wants_vector_tile
 from .serializers import GameSessionSerializer, VenueSerializer
 
 
@@ -38,6 +55,7 @@ def map_view(request):
 class GameSessionListCreateView(generics.ListCreateAPIView):
     queryset = GameSession.objects.select_related("venue").all().order_by("start_time")
     serializer_class = GameSessionSerializer
+    pagination_class = SessionCursorPagination
 
 
 # CRUD
@@ -51,6 +69,7 @@ class GameSessionDetailView(generics.RetrieveUpdateDestroyAPIView):
 class VenueListCreateView(generics.ListCreateAPIView):
     queryset = Venue.objects.all().order_by("name")
     serializer_class = VenueSerializer
+    pagination_class = VenueCursorPagination
 
 # Retrieve, update, or delete a specific Venue
 class VenueDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -62,15 +81,10 @@ class VenueDetailView(generics.RetrieveUpdateDestroyAPIView):
 def session_queryset_to_geojson(qs, include_distance: bool = False):
     features = []
     for s in qs:
-        lng = lat = None
-        if s.location:
-            lng = s.location.x
-            lat = s.location.y
-        elif s.venue and s.venue.location:
-            lng = s.venue.location.x
-            lat = s.venue.location.y
-        else:
+        if not s.effective_location:
             continue
+        lng = s.effective_location.x
+        lat = s.effective_location.y
 
         props = {
             "id": s.id,
@@ -99,55 +113,509 @@ def session_queryset_to_geojson(qs, include_distance: bool = False):
     return {"type": "FeatureCollection", "features": features}
 
 
-# Filters sessions based on province, matching points to County polygons
+# SQL and params selecting a queryset's ids, to embed as a raw SQL subquery.
+# With ordered=True it selects (id, map_pos), numbering the rows with
+# row_number() OVER (ORDER BY <the queryset's ordering>, id): the order of
+# a subquery's rows is not guaranteed to survive, an explicit position is
+def _ids_sql(qs, ordered: bool = False):
+    if not ordered:
+        return qs.order_by().values("id").query.sql_with_params()
+    ordering = list(qs.query.order_by)
+    if not ordering and qs.query.default_ordering:
+        ordering = list(qs.model._meta.ordering)
+    qs = qs.annotate(map_pos=models.Window(expression=RowNumber(), order_by=[*ordering, "id"]))
+    return qs.order_by().values("id", "map_pos").query.sql_with_params()
+
+
+# Session properties in feature order, as (json key, SQL expression)
+SESSION_SQL_PROPERTIES = (
+    ("id", "s.id"),
+    ("title", "s.title"),
+    ("description", "s.description"),
+    ("game_system", "s.game_system"),
+    ("points_level", "s.points_level"),
+    ("is_open", "s.is_open"),
+    # same format as DjangoJSONEncoder: millisecond precision, "Z" suffix
+    ("start_time", (
+        "to_char(s.start_time AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS')"
+        " || CASE WHEN date_trunc('second', s.start_time) = s.start_time THEN ''"
+        " ELSE to_char(s.start_time AT TIME ZONE 'UTC', '.MS') END || 'Z'"
+    )),
+    ("organiser", "s.organiser"),
+    ("organiser_contact", "s.organiser_contact"),
+    ("current_players", "s.current_players"),
+    ("max_players", "s.max_players"),
+)
+
+
+def _sql_json_object(pairs):
+    return "json_build_object(" + ", ".join(f"'{key}', {expr}" for key, expr in pairs) + ")"
+
+
+# Builds the whole FeatureCollection in PostgreSQL
+SESSION_GEOJSON_SQL = """
+    SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', COALESCE(
+            json_agg(
+                json_build_object(
+                    'type', 'Feature',
+                    'geometry', json_build_object(
+                        'type', 'Point',
+                        'coordinates', json_build_array(ST_X(f.geom), ST_Y(f.geom))
+                    ),
+                    'properties', f.props
+                )
+                ORDER BY f.pos
+            ),
+            '[]'::json
+        )
+    )::text
+    FROM (
+        SELECT
+            o.pos,
+            s.effective_location AS geom,
+            CASE WHEN v.id IS NULL THEN {props} ELSE {props_with_venue} END AS props
+        FROM (
+            SELECT ids.id, ids.map_pos AS pos FROM ({{ids_sql}}) ids
+        ) o
+        JOIN warhammer_gamesession s ON s.id = o.id
+        LEFT JOIN warhammer_venue v ON v.id = s.venue_id
+        WHERE s.effective_location IS NOT NULL
+    ) f;
+""".format(
+    props=_sql_json_object(SESSION_SQL_PROPERTIES),
+    props_with_venue=_sql_json_object(SESSION_SQL_PROPERTIES + (("venue_name", "v.name"),)),
+)
+
+
+# Same output as session_queryset_to_geojson, assembled by the database
+# in the queryset's order
+def session_queryset_to_geojson_sql(qs):
+    ids_sql, ids_params = _ids_sql(qs, ordered=True)
+    with connection.cursor() as cur:
+        cur.execute(SESSION_GEOJSON_SQL.format(ids_sql=ids_sql), ids_params)
+        return cur.fetchone()[0]
+
+
+# Binary responses are one vector tile covering the world (z0). An extent
+# of 2^26 keeps coordinates to ~0.6m at the equator (~0.4m in Ireland);
+# keys and repeated values such as game_system are dictionary-encoded
+MVT_WORLD_EXTENT = 1 << 26
+
+
+def _mvt_world_geom(column):
+    return (
+        f"ST_AsMVTGeom(ST_Transform({column}, 3857), ST_TileEnvelope(0, 0, 0),"
+        f" {MVT_WORLD_EXTENT}, 0, false)"
+    )
+
+
+# Same sessions and properties as SESSION_GEOJSON_SQL, as a "sessions" layer
+# (nulls such as a missing venue_name are left out, as in the GeoJSON).
+# Features are aggregated ORDER BY pos, as a subquery's order is not kept;
+# the LATERAL row holds only the feature columns, so pos is not encoded
+SESSION_MVT_SQL = """
+    SELECT ST_AsMVT(f, 'sessions', {extent}, 'geom' ORDER BY t.pos)
+    FROM (
+        SELECT o.pos, {geom} AS geom, {columns}, v.name AS venue_name
+        FROM (
+            SELECT ids.id, ids.map_pos AS pos FROM ({{ids_sql}}) ids
+        ) o
+        JOIN warhammer_gamesession s ON s.id = o.id
+        LEFT JOIN warhammer_venue v ON v.id = s.venue_id
+        WHERE s.effective_location IS NOT NULL
+    ) t
+    CROSS JOIN LATERAL (SELECT t.geom, {feature_columns}, t.venue_name) f;
+""".format(
+    extent=MVT_WORLD_EXTENT,
+    geom=_mvt_world_geom("s.effective_location"),
+    columns=", ".join(f"{expr} AS {key}" for key, expr in SESSION_SQL_PROPERTIES),
+    feature_columns=", ".join(f"t.{key}" for key, _ in SESSION_SQL_PROPERTIES),
+)
+
+VENUE_MVT_SQL = """
+    SELECT ST_AsMVT(f, 'venues', {extent}, 'geom' ORDER BY f.id)
+    FROM (
+        SELECT {geom} AS geom, id, name
+        FROM warhammer_venue
+        WHERE location IS NOT NULL
+    ) f;
+""".format(extent=MVT_WORLD_EXTENT, geom=_mvt_world_geom("location"))
+
+
+def _mvt_response(sql, params=()):
+    with connection.cursor() as cur:
+        cur.execute(sql, params)
+        row = cur.fetchone()
+    tile = bytes(row[0]) if row and row[0] else b""
+    return HttpResponse(tile, content_type="application/vnd.mapbox-vector-tile")
+
+
+# Sessions of a queryset as a world vector tile, in the queryset's order
+def session_queryset_to_mvt_response(qs):
+    ids_sql, ids_params = _ids_sql(qs, ordered=True)
+    return _mvt_response(SESSION_MVT_SQL.format(ids_sql=ids_sql), ids_params)
+
+
+# Responds with session GeoJSON from the configured engine ("sql" or
+# "python"), or a vector tile when the client asked for one
+def session_geojson_response(request, qs):
+    engine = request.GET.get("engine", "").strip() or getattr(settings, "GEOJSON_ENGINE", "sql")
+    if wants_vector_tile(request):
+        response = session_queryset_to_mvt_response(qs)
+    elif engine == "sql":
+        response = HttpResponse(session_queryset_to_geojson_sql(qs), content_type="application/json")
+    else:
+        with timed_serialization():
+            response = JsonResponse(session_queryset_to_geojson(qs))
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+# Columns read by the streaming GeoJSON mode (no model instances are built)
+SESSION_STREAM_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "game_system",
+    "points_level",
+    "is_open",
+    "start_time",
+    "organiser",
+    "organiser_contact",
+    "current_players",
+    "max_players",
+    "effective_location",
+    "venue_id",
+    "venue__name",
+)
+STREAM_CHUNK_SIZE = 2000
+
+
+# Converts session value rows into GeoJSON features, matching session_queryset_to_geojson
+def session_rows_to_features(rows):
+    for r in rows:
+        point = r["effective_location"]
+        if not point:
+            continue
+
+        props = {
+            "id": r["id"],
+            "title": r["title"],
+            "description": r["description"],
+            "game_system": r["game_system"],
+            "points_level": r["points_level"],
+            "is_open": r["is_open"],
+            "start_time": r["start_time"],
+            "organiser": r["organiser"],
+            "organiser_contact": r["organiser_contact"],
+            "current_players": r["current_players"],
+            "max_players": r["max_players"],
+        }
+        if r["venue_id"]:
+            props["venue_name"] = r["venue__name"]
+
+        yield {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [point.x, point.y]},
+            "properties": props,
+        }
+
+
+# Streams features as a FeatureCollection, byte-compatible with JsonResponse
+def stream_feature_collection(features):
+    yield '{"type": "FeatureCollection", "features": ['
+    buffer = []
+    sep = ""
+    for feature in features:
+        buffer.append(sep + json.dumps(feature, cls=DjangoJSONEncoder))
+        sep = ", "
+        if len(buffer) >= STREAM_CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+    yield "]}"
+
+
+def streaming_geojson_response(features):
+    return StreamingHttpResponse(
+        stream_feature_collection(features), content_type="application/json"
+    )
+
+
+# Groups sessions into grid cells in the database, one feature per cell
+SESSION_CLUSTER_SQL = """
+    WITH pts AS (
+        SELECT s.game_system, s.effective_location AS geom
+        FROM warhammer_gamesession s
+        WHERE s.id IN ({ids_sql})
+    ),
+    cells AS (
+        SELECT
+            ST_SnapToGrid(geom, %s) AS cell,
+            game_system,
+            COUNT(*) AS n,
+            ST_Collect(geom) AS geom
+        FROM pts
+        WHERE geom IS NOT NULL
+        GROUP BY 1, 2
+    )
+    SELECT
+        ST_X(ST_Centroid(ST_Collect(geom))),
+        ST_Y(ST_Centroid(ST_Collect(geom))),
+        SUM(n)::int,
+        json_object_agg(game_system, n)
+    FROM cells
+    GROUP BY cell;
+"""
+
+# Zoom levels up to this return clusters; above it, individual sessions
+CLUSTER_MAX_ZOOM = 12
+# Roughly one cluster per this many screen pixels at the requested zoom
+CLUSTER_CELL_PX = 64
+
+
+def session_queryset_to_clusters(qs, zoom: int):
+    cell_size = 360.0 / (256 * 2 ** zoom) * CLUSTER_CELL_PX
+    ids_sql, ids_params = _ids_sql(qs)
+    with connection.cursor() as cur:
+        cur.execute(SESSION_CLUSTER_SQL.format(ids_sql=ids_sql), [*ids_params, cell_size])
+        rows = cur.fetchall()
+    return cluster_rows_to_geojson(rows)
+
+
+# Converts (lng, lat, count, systems) cluster rows into a FeatureCollection
+def cluster_rows_to_geojson(rows):
+    features = []
+    for lng, lat, count, systems in rows:
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lng, lat]},
+            "properties": {"cluster": True, "count": count, "systems": systems},
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+# Filters sessions based on province, using the county assigned on save.
+# Building the filter makes no query, so the async views can compile it
+# without touching Django's sync connection
 def _filter_sessions_by_province(qs, province_name: str):
-    if not province_name:
-        return qs
     province_name = province_name.strip()
-    counties = County.objects.filter(province__iexact=province_name)
-    if not counties.exists():
+    if not province_name:
         return qs
-    province_q = models.Q()
-    for c in counties:
-        province_q |= (
-            models.Q(location__within=c.geom)
-            | models.Q(location__coveredby=c.geom)
-            | models.Q(location__intersects=c.geom)
-            | models.Q(venue__location__within=c.geom)
-            | models.Q(venue__location__coveredby=c.geom)
-            | models.Q(venue__location__intersects=c.geom)
+    return qs.filter(county__province__iexact=province_name)
+
+
+# Parses the optional from/to time window (ISO dates or datetimes; a date-only
+# "to" includes that whole day); raises ValueError on bad input
+def _parse_time_window(params):
+    window = []
+    for key in ("from", "to"):
+        raw = str(params.get(key) or "").strip()
+        if not raw:
+            window.append(None)
+            continue
+        value = parse_datetime(raw)
+        if value is None:
+            day = parse_date(raw)
+            if day is None:
+                raise ValueError(f"invalid {key}")
+            if key == "to":
+                day += timedelta(days=1)
+            value = datetime.combine(day, time.min)
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        window.append(value)
+    return window
+
+
+TIME_WINDOW_ERROR = {"error": "from and to must be ISO 8601 dates or datetimes"}
+
+
+SYNC_TOKEN_ERROR = {"error": "since must be 0 or a token from a previous response"}
+SYNC_EXPIRED_ERROR = {"error": "since is older than the deletion history; reload with since=0"}
+
+
+# Delta sync tokens are the database clock in microseconds since the epoch
+def _sync_token(moment):
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def _parse_sync_token(raw):
+    micros = int(raw)
+    if micros < 0:
+        raise ValueError("negative token")
+    return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc)
+
+
+# Answers ?since=<token>: features changed since the token (build_features
+# gets the window start and returns (features, ids of every row changed in
+# the window)), ids removed from the view, and the token for the next call.
+# since=0 is a full load; later windows overlap by SYNC_OVERLAP_SECONDS so
+# rows committed by slow transactions are not missed
+def sync_changes_response(raw, model, build_features):
+    try:
+        since = _parse_sync_token(raw)
+    except (ValueError, OverflowError, OSError):
+        return Response(SYNC_TOKEN_ERROR, status=status.HTTP_400_BAD_REQUEST)
+    full = since.timestamp() == 0
+    retention = timedelta(days=getattr(settings, "SYNC_TOMBSTONE_DAYS", 30))
+    if not full and since < timezone.now() - retention:
+        return Response(SYNC_EXPIRED_ERROR, status=status.HTTP_410_GONE)
+
+    with connection.cursor() as cur:
+        cur.execute("SELECT now()")
+        token = _sync_token(cur.fetchone()[0])
+
+    window_start = since - timedelta(seconds=getattr(settings, "SYNC_OVERLAP_SECONDS", 60))
+    features, changed_ids = build_features(window_start)
+    removed = set()
+    if not full:
+        sent = {f["properties"]["id"] for f in features}
+        removed = set(changed_ids) - sent
+        removed.update(
+            Tombstone.objects.filter(model=model, deleted_at__gt=window_start)
+            .values_list("object_id", flat=True)
         )
-    return qs.filter(province_q)
+    return timed_json_response({
+        "type": "FeatureCollection",
+        "features": features,
+        "removed": sorted(removed),
+        "token": token,
+    })
 
 
-# Returns sessions as GeoJSON, with text and filter support
-@api_view(["GET"])
-def sessions_geojson(request):
-    q = request.GET.get("q", "").strip()
-    system = request.GET.get("system", "").strip()
-    open_only = request.GET.get("open", "").strip()
-    province = request.GET.get("province", "").strip()
+# Keeps sessions starting within [start, end)
+def _filter_sessions_by_time(qs, start, end):
+    if start:
+        qs = qs.filter(start_time__gte=start)
+    if end:
+        qs = qs.filter(start_time__lt=end)
+    return qs
+
+
+# Full-text search on the maintained search_vector, with trigram matching
+# for typos (e.g. "Wahammer"); results are ranked by relevance
+def _search_sessions(qs, q: str):
+    query = SearchQuery(q, config="english", search_type="websearch")
+    return (
+        qs.annotate(
+            # ts_rank and word_similarity return real; as double precision
+            # the values round-trip exactly through pagination cursors
+            rank=Cast(SearchRank(models.F("search_vector"), query), models.FloatField()),
+            similarity=Cast(
+                Greatest(
+                    TrigramWordSimilarity(q, "title"),
+                    TrigramWordSimilarity(q, "game_system"),
+                    TrigramWordSimilarity(q, "venue__name"),
+                ),
+                models.FloatField(),
+            ),
+        )
+        # every arm is on the session table (the venue arm is a subquery on
+        # venue ids, not the join), so PostgreSQL can BitmapOr the indexes
+        .filter(
+            models.Q(search_vector=query)
+            | models.Q(title__trigram_word_similar=q)
+            | models.Q(game_system__trigram_word_similar=q)
+            | models.Q(venue_id__in=Venue.objects.filter(name__trigram_word_similar=q).values("id"))
+        )
+        .order_by("-rank", "-similarity", "start_time")
+    )
 
+
+# Sessions matching the shared map parameters: q, system, open, province,
+# from/to and an optional (west, south, east, north) bbox. Raises ValueError
+# for a bad time window. Every session map endpoint (GeoJSON, bbox, tile,
+# nearest, batch, facets) filters through here, and the async views
+# compile this same queryset to SQL
+def filtered_sessions(params, bbox=None):
+    start, end = _parse_time_window(params)
     qs = GameSession.objects.select_related("venue").all()
-    if q:
-        qs = qs.filter(
-            models.Q(title__icontains=q)
-            | models.Q(description__icontains=q)
-            | models.Q(game_system__icontains=q)
-            | models.Q(venue__name__icontains=q)
+    if bbox:
+        # built in SQL from plain numbers, so the compiled query also runs
+        # on the async pool's connections (which lack Django's geometry adapter)
+        envelope = models.Func(
+            *(models.Value(float(edge)) for edge in bbox), models.Value(4326),
+            function="ST_MakeEnvelope",
+            output_field=PolygonField(srid=4326),
         )
+        qs = qs.filter(effective_location__within=envelope)
+    q = (params.get("q") or "").strip()
+    if q:
+        qs = _search_sessions(qs, q)
+    system = (params.get("system") or "").strip()
     if system:
         qs = qs.filter(game_system=system)
-    if open_only:
+    if str(params.get("open") or "").strip():
         qs = qs.filter(is_open=True)
-    qs = _filter_sessions_by_province(qs, province)
-    return JsonResponse(session_queryset_to_geojson(qs))
+    qs = _filter_sessions_by_time(qs, start, end)
+    return _filter_sessions_by_province(qs, (params.get("province") or "").strip())
+
+
+# Returns sessions as GeoJSON, with text and filter support
+@api_view(["GET"])
+@renderer_classes(MAP_RENDERERS)
+def sessions_geojson(request):
+    stream = request.GET.get("stream", "").strip()
+    try:
+        qs = filtered_sessions(request.GET)
+    except ValueError:
+        return Response(TIME_WINDOW_ERROR, status=status.HTTP_400_BAD_REQUEST)
+
+    since = request.GET.get("since", "").strip()
+    if since:
+        def changed_sessions(window_start):
+            changed = GameSession.objects.filter(updated_at__gt=window_start)
+            features = session_queryset_to_geojson(qs.filter(updated_at__gt=window_start))["features"]
+            return features, changed.values_list("id", flat=True)
+
+        return sync_changes_response(since, "session", changed_sessions)
+    if stream and not wants_vector_tile(request):
+        rows = qs.values(*SESSION_STREAM_FIELDS).iterator(chunk_size=STREAM_CHUNK_SIZE)
+        return streaming_geojson_response(session_rows_to_features(rows))
+    return session_geojson_response(request, qs)
+
+
+# Converts venue value rows into GeoJSON point features
+def venue_rows_to_features(rows):
+    for r in rows:
+        yield {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [r["location"].x, r["location"].y]},
+            "properties": {"id": r["id"], "name": r["name"]},
+        }
 
 
 # Returns all venues as GeoJSON point features
+@cached_by_data_version
 @api_view(["GET"])
+@renderer_classes(MAP_RENDERERS)
 def venues_geojson(request):
-    venues = Venue.objects.all()
+    since = request.GET.get("since", "").strip()
+    if since:
+        def changed_venues(window_start):
+            changed = Venue.objects.filter(updated_at__gt=window_start)
+            rows = changed.filter(location__isnull=False).values("id", "name", "location")
+            return list(venue_rows_to_features(rows)), changed.values_list("id", flat=True)
+
+        return sync_changes_response(since, "venue", changed_venues)
+
+    if wants_vector_tile(request):
+        return _mvt_response(VENUE_MVT_SQL)
+    if request.GET.get("stream", "").strip():
+        rows = (
+            Venue.objects.filter(location__isnull=False)
+            .order_by("id")
+            .values("id", "name", "location")
+            .iterator(chunk_size=STREAM_CHUNK_SIZE)
+        )
+        return streaming_geojson_response(venue_rows_to_features(rows))
+
+    # by id, the same order as the vector tile
+    venues = Venue.objects.order_by("id")
     features = []
     for v in venues:
         if not v.location:
@@ -157,27 +625,27 @@ def venues_geojson(request):
             "geometry": {"type": "Point", "coordinates": [v.location.x, v.location.y]},
             "properties": {"id": v.id, "name": v.name},
         })
-    return JsonResponse({"type": "FeatureCollection", "features": features})
+    return timed_json_response({"type": "FeatureCollection", "features": features})
 
 
-# Simple search view
+# Simple search view, paginated by cursor
 @api_view(["GET"])
 def sessions_search(request):
     q = request.GET.get("q", "").strip()
-    qs = GameSession.objects.all()
+    qs = GameSession.objects.select_related("venue").all()
     if q:
-        qs = qs.filter(
-            models.Q(title__icontains=q)
-            | models.Q(description__icontains=q)
-            | models.Q(game_system__icontains=q)
-        )
-    data = [GameSessionSerializer(s).data for s in qs]
-    return JsonResponse(data, safe=False)
+        qs = _search_sessions(qs, q)
+        paginator = SessionSearchCursorPagination()
+    else:
+        paginator = SessionCursorPagination()
+    page = paginator.paginate_queryset(qs, request)
+    return paginator.get_paginated_response(GameSessionSerializer(page, many=True).data)
 
 
 # Spatial query: 
 # sessions within the visible map bounding box
 @api_view(["GET"])
+@renderer_classes(MAP_RENDERERS)
 def sessions_in_bbox(request):
     try:
         west = float(request.GET.get("west"))
@@ -190,24 +658,139 @@ def sessions_in_bbox(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    system = request.GET.get("system", "").strip()
-    open_only = request.GET.get("open", "").strip()
-    province = request.GET.get("province", "").strip()
+    cluster = request.GET.get("cluster", "").strip()
+    zoom = None
+    if cluster:
+        try:
+            zoom = int(request.GET.get("zoom"))
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "zoom is required as an integer when cluster is set"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-    bbox = Polygon.from_bbox((west, south, east, north))
-    bbox.srid = 4326
+    try:
+        qs = filtered_sessions(request.GET, (west, south, east, north))
+    except ValueError:
+        return Response(TIME_WINDOW_ERROR, status=status.HTTP_400_BAD_REQUEST)
+    if zoom is not None and zoom <= CLUSTER_MAX_ZOOM:
+        return timed_json_response(session_queryset_to_clusters(qs, zoom))
+    return session_geojson_response(request, qs)
 
-    qs = (
-        GameSession.objects.select_related("venue")
-        .filter(models.Q(location__within=bbox) | models.Q(venue__location__within=bbox))
-        .distinct()
+
+# Mapbox Vector Tile for sessions in a z/x/y web mercator tile
+SESSION_TILE_SQL = """
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(%s, %s, %s) AS geom
+    ),
+    mvtgeom AS (
+        SELECT
+            ST_AsMVTGeom(
+                ST_Transform(s.effective_location, 3857),
+                bounds.geom
+            ) AS geom,
+            s.id,
+            s.title,
+            s.game_system,
+            s.is_open,
+            s.start_time::text AS start_time,
+            s.current_players,
+            s.max_players,
+            v.name AS venue_name
+        FROM warhammer_gamesession s
+        LEFT JOIN warhammer_venue v ON v.id = s.venue_id
+        CROSS JOIN bounds
+        WHERE s.effective_location && ST_Transform(bounds.geom, 4326)
+        AND s.id IN ({ids_sql})
     )
-    if system:
-        qs = qs.filter(game_system=system)
-    if open_only:
-        qs = qs.filter(is_open=True)
-    qs = _filter_sessions_by_province(qs, province)
-    return JsonResponse(session_queryset_to_geojson(qs))
+    SELECT ST_AsMVT(mvtgeom.*, 'sessions', 4096, 'geom') FROM mvtgeom;
+"""
+
+SESSION_TILE_MAX_ZOOM = 22
+SESSION_TILE_MAX_AGE = 60
+
+
+# Spatial query:
+# sessions as a vector tile, cacheable by its fixed z/x/y URL
+@api_view(["GET"])
+def sessions_tile(request, z, x, y):
+    if z > SESSION_TILE_MAX_ZOOM or x >= 2 ** z or y >= 2 ** z:
+        return Response({"error": "Tile coordinates out of range"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        qs = filtered_sessions(request.GET)
+    except ValueError:
+        return Response(TIME_WINDOW_ERROR, status=status.HTTP_400_BAD_REQUEST)
+
+    ids_sql, ids_params = _ids_sql(qs)
+    with connection.cursor() as cur:
+        cur.execute(SESSION_TILE_SQL.format(ids_sql=ids_sql), [z, x, y, *ids_params])
+        row = cur.fetchone()
+
+    tile = bytes(row[0]) if row and row[0] else b""
+    response = HttpResponse(tile, content_type="application/vnd.mapbox-vector-tile")
+    response["Cache-Control"] = f"public, max-age={SESSION_TILE_MAX_AGE}"
+    return response
+
+
+# Two-phase nearest search. Candidates are collected by walking the
+# effective_location GiST index with the KNN "<->" operator, then
+# re-ranked by exact spheroid distance.
+SESSION_NEAREST_SQL = """
+    WITH candidates AS (
+        SELECT s.id, s.effective_location AS geom
+        FROM warhammer_gamesession s
+        WHERE s.effective_location IS NOT NULL AND s.id IN ({ids_sql})
+        ORDER BY s.effective_location <-> ST_SetSRID(ST_MakePoint(%s, %s), 4326)
+        LIMIT %s
+    )
+    SELECT id, distance FROM (
+        SELECT c.id, ST_Distance(c.geom::geography, ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography) AS distance
+        FROM candidates c
+    ) ranked
+    {where}
+    ORDER BY distance, id
+    LIMIT %s;
+"""
+
+NEAREST_DEFAULT_LIMIT = 10
+NEAREST_MAX_LIMIT = 100
+# Candidates fetched per result, so planar KNN order can be refined on the spheroid
+NEAREST_CANDIDATE_FACTOR = 4
+NEAREST_MIN_CANDIDATES = 50
+
+
+# Returns up to `limit` sessions nearest to a point, closest first,
+# each with a `distance` measure
+def nearest_sessions(qs, lng: float, lat: float, limit: int, max_distance_m=None):
+    ids_sql, ids_params = _ids_sql(qs)
+    candidates = max(limit * NEAREST_CANDIDATE_FACTOR, NEAREST_MIN_CANDIDATES)
+    where = ""
+    where_params = []
+    if max_distance_m is not None:
+        where = "WHERE distance <= %s"
+        where_params = [max_distance_m]
+
+    sql = SESSION_NEAREST_SQL.format(ids_sql=ids_sql, where=where)
+    params = [
+        *ids_params, lng, lat, candidates,
+        lng, lat,
+        *where_params,
+        limit,
+    ]
+    with connection.cursor() as cur:
+        cur.execute(sql, params)
+        ranked = cur.fetchall()
+
+    by_id = GameSession.objects.select_related("venue").in_bulk([pk for pk, _ in ranked])
+    sessions = []
+    for pk, distance in ranked:
+        session = by_id.get(pk)
+        if session is None:
+            continue
+        session.distance = D(m=distance)
+        sessions.append(session)
+    return sessions
 
 
 # Spatial query: 
@@ -226,33 +809,314 @@ def sessions_nearest(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    limit_raw = request.data.get("limit", 10)
+    limit_raw = request.data.get("limit", NEAREST_DEFAULT_LIMIT)
     try:
         limit = int(limit_raw)
     except (TypeError, ValueError):
-        limit = 10
-
-    system = (request.data.get("system") or "").strip()
-    open_only = (str(request.data.get("open") or "")).strip()
-    province = (request.data.get("province") or "").strip()
+        limit = NEAREST_DEFAULT_LIMIT
+    limit = max(1, min(limit, NEAREST_MAX_LIMIT))
 
-    user_point = Point(lng, lat, srid=4326)
-    qs = GameSession.objects.filter(location__isnull=False).annotate(
-        distance=Distance("location", user_point)
-    ).order_by("distance")
+    max_distance_m = request.data.get("max_distance_m")
+    if max_distance_m is not None:
+        try:
+            max_distance_m = float(max_distance_m)
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "max_distance_m must be a number"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-    if system:
-        qs = qs.filter(game_system=system)
-    if open_only:
-        qs = qs.filter(is_open=True)
-    qs = _filter_sessions_by_province(qs, province)[:limit]
+    try:
+        qs = filtered_sessions(request.data)
+    except ValueError:
+        return Response(TIME_WINDOW_ERROR, status=status.HTTP_400_BAD_REQUEST)
 
-    geojson = session_queryset_to_geojson(qs, include_distance=True)
+    sessions = nearest_sessions(qs, lng, lat, limit, max_distance_m)
+    geojson = session_queryset_to_geojson(sessions, include_distance=True)
     geojson["search_point"] = {"lat": lat, "lng": lng}
     return Response(geojson)
 
 
+# Runs many bbox / nearest / radius lookups in one statement: the
+# sub-queries are a VALUES list, each row joined LATERAL to the branch
+# for its kind (the other branches are skipped by a one-time filter).
+# Every branch keeps its index: bbox and radius use the effective_location
+# GiST index, nearest walks it with KNN like SESSION_NEAREST_SQL.
+SESSION_BATCH_SQL = """
+    WITH q (pos, key, kind, west, south, east, north, lng, lat, lim, radius_m) AS (
+        VALUES {values}
+    ),
+    results AS (
+        SELECT
+            q.pos,
+            q.key,
+            json_build_object(
+                'type', 'FeatureCollection',
+                'features', COALESCE(
+                    json_agg(
+                        json_build_object(
+                            'type', 'Feature',
+                            'geometry', json_build_object(
+                                'type', 'Point',
+                                'coordinates', json_build_array(ST_X(s.effective_location), ST_Y(s.effective_location))
+                            ),
+                            'properties', json_strip_nulls({props})
+                        )
+                        ORDER BY r.rank
+                    ) FILTER (WHERE s.id IS NOT NULL AND r.rank <= q.lim),
+                    '[]'::json
+                ),
+                -- each branch fetches one row past the limit to detect this
+                'truncated', count(r.id) > q.lim
+            ) AS collection
+        FROM q
+        LEFT JOIN LATERAL (
+            (SELECT s.id, NULL::float8 AS distance,
+                   row_number() OVER (ORDER BY s.start_time, s.id) AS rank
+            FROM warhammer_gamesession s
+            WHERE q.kind = 'bbox'
+            AND ST_Within(s.effective_location, ST_MakeEnvelope(q.west, q.south, q.east, q.north, 4326))
+            AND s.id IN ({{ids_sql}})
+            ORDER BY s.start_time, s.id
+            LIMIT q.lim + 1)
+
+            UNION ALL
+
+            (SELECT ranked.id, ranked.distance,
+                   row_number() OVER (ORDER BY ranked.distance, ranked.id) AS rank
+            FROM (
+                SELECT c.id, ST_Distance(
+                    c.geom::geography, ST_SetSRID(ST_MakePoint(q.lng, q.lat), 4326)::geography
+                ) AS distance
+                FROM (
+                    SELECT s.id, s.effective_location AS geom
+                    FROM warhammer_gamesession s
+                    WHERE q.kind = 'nearest'
+                    AND s.effective_location IS NOT NULL
+                    AND s.id IN ({{ids_sql}})
+                    ORDER BY s.effective_location <-> ST_SetSRID(ST_MakePoint(q.lng, q.lat), 4326)
+                    LIMIT GREATEST(q.lim * {candidate_factor}, {min_candidates})
+                ) c
+            ) ranked
+            WHERE q.radius_m IS NULL OR ranked.distance <= q.radius_m
+            ORDER BY ranked.distance, ranked.id
+            LIMIT q.lim + 1)
+
+            UNION ALL
+
+            (SELECT nearby.id, nearby.distance,
+                   row_number() OVER (ORDER BY nearby.distance, nearby.id) AS rank
+            FROM (
+                SELECT s.id, ST_Distance(
+                    s.effective_location::geography, ST_SetSRID(ST_MakePoint(q.lng, q.lat), 4326)::geography
+                ) AS distance
+                FROM warhammer_gamesession s
+                WHERE q.kind = 'radius'
+                -- index prefilter: the radius converted to degrees, padded by a tenth
+                AND s.effective_location && ST_Expand(
+                    ST_SetSRID(ST_MakePoint(q.lng, q.lat), 4326),
+                    1.1 * q.radius_m / (111320 * GREATEST(cos(radians(q.lat)), 0.01)),
+                    1.1 * q.radius_m / 110574
+                )
+                AND ST_DWithin(
+                    s.effective_location::geography,
+                    ST_SetSRID(ST_MakePoint(q.lng, q.lat), 4326)::geography,
+                    q.radius_m
+                )
+                AND s.id IN ({{ids_sql}})
+            ) nearby
+            ORDER BY nearby.distance, nearby.id
+            LIMIT q.lim + 1)
+        ) r ON TRUE
+        LEFT JOIN warhammer_gamesession s ON s.id = r.id
+        LEFT JOIN warhammer_venue v ON v.id = s.venue_id
+        GROUP BY q.pos, q.key, q.lim
+    )
+    SELECT json_build_object(
+        'results', json_object_agg(key, collection ORDER BY pos)
+    )::text
+    FROM results;
+""".format(
+    values="{values}",
+    props=_sql_json_object(SESSION_SQL_PROPERTIES + (
+        ("venue_name", "v.name"),
+        ("distance_m", "round(r.distance::numeric, 2)"),
+    )),
+    candidate_factor=NEAREST_CANDIDATE_FACTOR,
+    min_candidates=NEAREST_MIN_CANDIDATES,
+)
+# one typed VALUES row per sub-query
+SESSION_BATCH_ROW = (
+    "(%s::int, %s::text, %s::text, %s::float8, %s::float8, %s::float8, %s::float8,"
+    " %s::float8, %s::float8, %s::int, %s::float8)"
+)
+
+BATCH_MAX_QUERIES = 20
+# Largest (and default) limit of a bbox or radius sub-query
+BATCH_MAX_RESULTS = 500
+BATCH_RADIUS_MAX_M = 100_000
+
+
+def _batch_float(query, name):
+    try:
+        return float(query.get(name))
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} is required and must be a number")
+
+
+def _batch_limit(query, default, maximum):
+    try:
+        limit = int(query.get("limit", default))
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if not 1 <= limit <= maximum:
+        raise ValueError(f"limit must be between 1 and {maximum}")
+    return limit
+
+
+# Validates one sub-query into a VALUES row (raises ValueError)
+def _batch_row(pos, query):
+    if not isinstance(query, dict):
+        raise ValueError("must be an object")
+    key = str(query.get("key", pos))
+    kind = query.get("type")
+    if kind == "bbox":
+        west, south, east, north = (_batch_float(query, edge) for edge in ("west", "south", "east", "north"))
+        limit = _batch_limit(query, BATCH_MAX_RESULTS, BATCH_MAX_RESULTS)
+        return [pos, key, kind, west, south, east, north, None, None, limit, None]
+    if kind == "nearest":
+        lat, lng = _batch_float(query, "lat"), _batch_float(query, "lng")
+        limit = _batch_limit(query, NEAREST_DEFAULT_LIMIT, NEAREST_MAX_LIMIT)
+        max_distance_m = None
+        if query.get("max_distance_m") is not None:
+            max_distance_m = _batch_float(query, "max_distance_m")
+        return [pos, key, kind, None, None, None, None, lng, lat, limit, max_distance_m]
+    if kind == "radius":
+        lat, lng = _batch_float(query, "lat"), _batch_float(query, "lng")
+        radius_m = _batch_float(query, "radius_m")
+        if not 0 < radius_m <= BATCH_RADIUS_MAX_M:
+            raise ValueError(f"radius_m must be between 0 and {BATCH_RADIUS_MAX_M}")
+        limit = _batch_limit(query, BATCH_MAX_RESULTS, BATCH_MAX_RESULTS)
+        return [pos, key, kind, None, None, None, None, lng, lat, limit, radius_m]
+    raise ValueError("type must be one of bbox, nearest, radius")
+
+
+# Spatial query:
+# several bbox / nearest / radius lookups in one round trip, keyed per
+# sub-query; system/open/province/from/to apply to all of them
+@csrf_exempt
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([])
+def sessions_batch(request):
+    queries = request.data.get("queries")
+    if not isinstance(queries, list) or not 0 < len(queries) <= BATCH_MAX_QUERIES:
+        return Response(
+            {"error": f"queries must be a list of 1 to {BATCH_MAX_QUERIES} sub-queries"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    rows = []
+    for pos, query in enumerate(queries):
+        try:
+            rows.append(_batch_row(pos, query))
+        except ValueError as exc:
+            return Response({"error": f"queries[{pos}]: {exc}"}, status=status.HTTP_400_BAD_REQUEST)
+    if len({row[1] for row in rows}) != len(rows):
+        return Response({"error": "sub-query keys must be unique"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        qs = filtered_sessions(request.data)
+    except ValueError:
+        return Response(TIME_WINDOW_ERROR, status=status.HTTP_400_BAD_REQUEST)
+
+    ids_sql, ids_params = _ids_sql(qs)
+    sql = SESSION_BATCH_SQL.format(values=", ".join([SESSION_BATCH_ROW] * len(rows)), ids_sql=ids_sql)
+    params = [value for row in rows for value in row] + list(ids_params) * 3
+    with connection.cursor() as cur:
+        cur.execute(sql, params)
+        return HttpResponse(cur.fetchone()[0], content_type="application/json")
+
+
+# Counts matching sessions per game system, province and open status in one
+# grouped query
+SESSION_FACETS_SQL = """
+    SELECT
+        s.game_system,
+        c.province,
+        s.is_open,
+        COUNT(*),
+        GROUPING(s.game_system),
+        GROUPING(c.province),
+        GROUPING(s.is_open)
+    FROM warhammer_gamesession s
+    LEFT JOIN warhammer_county c ON c.id = s.county_id
+    WHERE s.id IN ({ids_sql})
+    GROUP BY GROUPING SETS ((s.game_system), (c.province), (s.is_open), ());
+"""
+
+FACETS_CACHE_TTL = 30
+# bbox edges are rounded so nearby viewports share a cache entry
+FACETS_BBOX_DECIMALS = 3
+
+
+def session_facets(qs):
+    ids_sql, ids_params = _ids_sql(qs)
+    with connection.cursor() as cur:
+        cur.execute(SESSION_FACETS_SQL.format(ids_sql=ids_sql), ids_params)
+        rows = cur.fetchall()
+
+    facets = {"total": 0, "game_system": [], "province": [], "is_open": {"open": 0, "closed": 0}}
+    for system, province, is_open, count, g_system, g_province, g_open in rows:
+        if not g_system:
+            facets["game_system"].append({"value": system, "count": count})
+        elif not g_province:
+            if province:
+                facets["province"].append({"value": province, "count": count})
+        elif not g_open:
+            facets["is_open"]["open" if is_open else "closed"] = count
+        else:
+            facets["total"] = count
+    for key in ("game_system", "province"):
+        facets[key].sort(key=lambda f: (-f["count"], f["value"]))
+    return facets
+
+
+# Returns session counts per game system, province and open status for the
+# current bbox and filters (cached briefly per normalized filter set)
+@api_view(["GET"])
+def sessions_facets(request):
+    params = {key: request.GET.get(key, "").strip() for key in ("q", "system", "open", "province", "from", "to")}
+    bbox = None
+    if request.GET.get("west"):
+        try:
+            bbox = [
+                round(float(request.GET.get(edge)), FACETS_BBOX_DECIMALS)
+                for edge in ("west", "south", "east", "north")
+            ]
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "west, south, east, north must all be floats"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    try:
+        _parse_time_window(params)
+    except ValueError:
+        return Response(TIME_WINDOW_ERROR, status=status.HTTP_400_BAD_REQUEST)
+
+    cache = map_data_cache()
+    # hashed, as raw q text would make the key unbounded and hold spaces
+    filters = json.dumps({**params, "bbox": bbox}, sort_keys=True)
+    digest = hashlib.md5(filters.encode("utf-8")).hexdigest()
+    cache_key = f"warhammer:facets:{data_version()}:{digest}"
+    facets = cache.get(cache_key)
+    if facets is None:
+        facets = session_facets(filtered_sessions(params, bbox))
+        cache.set(cache_key, facets, FACETS_CACHE_TTL)
+    return Response(facets)
+
+
 # Returns a list of all game systems for the filter dropdown
+@cached_by_data_version
 @api_view(["GET"])
 def sessions_distinct_systems(request):
     systems = (
@@ -264,7 +1128,8 @@ def sessions_distinct_systems(request):
     return Response(sorted(systems))
 
 
-# Returns the county covering a given point
+# Returns the county covering a given point, from the in-process county index
+# (?geometry=full|simplified|none controls how much boundary is returned)
 @api_view(["GET"])
 def county_for_point(request):
     lat = request.GET.get("lat")
@@ -276,23 +1141,76 @@ def county_for_point(request):
         lng = float(lng)
     except ValueError:
         return Response({"error": "lat and lng must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
-    pt = Point(lng, lat, srid=4326)
-    county = County.objects.filter(geom__covers=pt).first()
-    if not county:
-        county = County.objects.filter(geom__intersects=pt).first()
+    detail = request.GET.get("geometry", "full").strip() or "full"
+    if detail not in ("full", "simplified", "none"):
+        return Response(
+            {"error": "geometry must be one of full, simplified, none"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    county = county_index().lookup(Point(lng, lat, srid=4326))
     if not county:
         return Response({"error": "No county found"}, status=status.HTTP_404_NOT_FOUND)
-    return Response(CountySerializer(county).data)
+    return Response(county.to_feature(detail))
+
+
+# Builds an outline FeatureCollection in PostgreSQL from a boundary table,
+# using the pre-simplified column for the zoom (6 decimals is ~10cm)
+BOUNDARY_GEOJSON_SQL = """
+    SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', COALESCE(
+            json_agg(
+                json_build_object(
+                    'type', 'Feature',
+                    'id', id,
+                    'geometry', ST_AsGeoJSON(COALESCE({column}, geom), 6)::json,
+                    'properties', {properties}
+                )
+                ORDER BY name
+            ),
+            '[]'::json
+        )
+    )::text
+    FROM {table};
+"""
+
+# Zoom assumed when none is given (whole of Ireland in view)
+BOUNDARY_DEFAULT_ZOOM = 7
+
+
+def _boundary_geojson_response(request, table, properties):
+    try:
+        zoom = int(request.GET.get("zoom", BOUNDARY_DEFAULT_ZOOM))
+    except ValueError:
+        return Response({"error": "zoom must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    sql = BOUNDARY_GEOJSON_SQL.format(
+        column=boundary_column_for_zoom(zoom), table=table, properties=properties
+    )
+    with connection.cursor() as cur:
+        cur.execute(sql)
+        return HttpResponse(cur.fetchone()[0], content_type="application/json")
+
+
+# Returns county outlines as GeoJSON, simplified for the requested zoom
+@cached_by_boundary_version
+@api_view(["GET"])
+def counties_geojson(request):
+    return _boundary_geojson_response(
+        request, "warhammer_county", "json_build_object('name', name, 'province', province)"
+    )
+
+
+# Returns province outlines as GeoJSON, simplified for the requested zoom
+@cached_by_boundary_version
+@api_view(["GET"])
+def provinces_geojson(request):
+    return _boundary_geojson_response(
+        request, "warhammer_province", "json_build_object('name', name)"
+    )
 
 
 # Returns all unique provinces for the filter dropdown
+@cached_by_boundary_version
 @api_view(["GET"])
 def distinct_provinces(request):
-    qs = (
-        County.objects.exclude(province__isnull=True)
-        .exclude(province__exact="")
-        .order_by("province")
-        .values_list("province", flat=True)
-        .distinct()
-    )
-    return Response(list(qs))
+    return Response(list(Province.objects.values_list("name", flat=True)))
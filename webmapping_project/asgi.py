@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+The async map endpoints under /api/async/ use a psycopg 3 connection pool
+bound to the server's event loop, so serve them with an ASGI server, e.g.
+``uvicorn webmapping_project.asgi:application --workers 2``.
 """
 
 import os
@@ -12,5 +16,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webmapping_project.settings')
+# tells the settings to drop persistent sync connections (see CONN_MAX_AGE)
+os.environ['WARHAMMER_ASGI'] = '1'
 
 application = get_asgi_application()
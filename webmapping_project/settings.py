@@ -19,6 +19,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.gis",      # GeoDjango
+    "django.contrib.postgres", # full-text and trigram search
     "rest_framework",          # API
     "corsheaders",             # CORS support
     "django_filters",          # filtering
@@ -26,6 +27,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "warhammer.instrumentation.RequestInstrumentationMiddleware",
+    "warhammer.metrics.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -38,6 +41,17 @@ MIDDLEWARE = [
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Per-request query/serialization timings as Server-Timing headers, and
+# logging of requests slower than SLOW_REQUEST_MS (with EXPLAIN ANALYZE
+# plans of the slowest statements if SLOW_REQUEST_EXPLAIN is set)
+INSTRUMENT_REQUESTS = DEBUG
+SLOW_REQUEST_MS = 500
+SLOW_REQUEST_EXPLAIN = False
+
+# Prometheus metrics at /metrics (set PROMETHEUS_MULTIPROC_DIR to aggregate
+# across worker processes)
+METRICS_ENABLED = True
+
 ROOT_URLCONF = "webmapping_project.urls"
 
 TEMPLATES = [
@@ -58,6 +72,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "webmapping_project.wsgi.application"
 
+# Set by asgi.py before the settings load
+SERVING_ASGI = os.environ.get("WARHAMMER_ASGI") == "1"
+
 DATABASES = {
     "default": {
         "ENGINE": "django.contrib.gis.db.backends.postgis",
@@ -66,9 +83,34 @@ DATABASES = {
         "PASSWORD": "C22793219",
         "HOST": "localhost",
         "PORT": "5432",
+        # reuse connections between requests, checking them before reuse.
+        # Not under ASGI: sync code runs on per-request threads there, and
+        # each would keep its own connection open
+        "CONN_MAX_AGE": 0 if SERVING_ASGI else 60,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# psycopg 3 pool used by the async (ASGI) map endpoints
+ASYNC_DB_POOL = {
+    "MIN_SIZE": 2,
+    "MAX_SIZE": 20,
+    "TIMEOUT": 10,
+}
+
+# Versioned map data cache: local memory by default; point it at Redis
+# (django.core.cache.backends.redis.RedisCache) to share it between workers
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "map_data": {
+        "BACKEND": os.environ.get("MAP_DATA_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("MAP_DATA_CACHE_LOCATION", "map-data"),
+    },
+}
+MAP_DATA_CACHE = "map_data"
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -88,6 +130,19 @@ STATICFILES_DIRS = [
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Session GeoJSON engine: "sql" (built by PostgreSQL) or "python" (fallback)
+GEOJSON_ENGINE = "sql"
+
+# Live session updates: the broker fanning changes out to subscribers, and
+# whether changes travel through PostgreSQL NOTIFY (needed with several workers)
+LIVE_BROKER = "warhammer.live.InProcessBroker"
+LIVE_UPDATES_NOTIFY = False
+
+# Delta sync (?since=<token>): how long deletions are remembered, and how far
+# each window reaches back to catch rows committed by slow transactions
+SYNC_TOMBSTONE_DAYS = 30
+SYNC_OVERLAP_SECONDS = 60
+
 GDAL_LIBRARY_PATH = r"C:\OSGeo4W64\bin\gdal311.dll"
 GEOS_LIBRARY_PATH = r"C:\OSGeo4W64\bin\geos_c.dll"
 PROJ_LIB = r"C:\OSGeo4W64\share\proj"
@@ -1,9 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include
 from warhammer import views  
+from warhammer.metrics import metrics_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", views.map_view, name="map"),
     path("api/", include("warhammer.urls")),
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -5,6 +5,10 @@ It exposes the WSGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
+
+When running several worker processes, set PROMETHEUS_MULTIPROC_DIR to an
+empty, writable directory before starting the server so /metrics
+aggregates across workers (see README).
 """
 
 import os